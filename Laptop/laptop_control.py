@@ -4,14 +4,20 @@ Laptop Control Interface - WASD Keyboard Edition
 GUI for robot control with keyboard input, debug mode, and game integration
 """
 
+import ctypes
 import json
 import os
+import select
+import shlex
+import signal
 import socket
+import struct
 import subprocess
 import sys
 import threading
 import time
 import tkinter as tk
+from collections import namedtuple
 from tkinter import ttk, messagebox, simpledialog
 from typing import Optional, Dict
 
@@ -40,18 +46,63 @@ DEFAULT_CONTROLS = {
 }
 
 SEND_HZ = 30
+IDLE_SEND_HZ = 10  # Control loop rate with no movement/fire key held (key events still wake it at once)
+CONTROL_KEEPALIVE_S = 0.25  # Resend an unchanged CONTROL this often (Pi command timeout is 0.8s)
 CONFIG_REQUEST_TIMEOUT = 5.0  # Seconds to wait for Pi to send config
+GUI_POLL_MS = 100  # update_gui tick; it only redraws when something changed...
+GUI_KEEPALIVE_S = 0.25  # ...or at least this often
+GUI_IDLE_POLL_MS = 250  # Tick after a poll that found nothing to redraw (back to GUI_POLL_MS on the next redraw)
+KEY_RELEASE_DEBOUNCE_MS = 20  # X11 autorepeat sends Release+Press pairs while a key is held
+SEND_ERROR_BACKOFF_S = 0.5  # After a failed send to the robot, hold off further sends this long (2 Hz retries)
+VIDEO_STOP_TIMEOUT_S = 2.0  # Grace period for gst-launch to exit after Ctrl+Break before it is killed
+WINDOWS_TIMER_RES_MS = 1  # Default Windows timer tick is ~15.6ms - too coarse for a 33ms send period
 
 GST_RECEIVER_CMD_TEMPLATE = (
     'gst-launch-1.0 -v udpsrc port={port} caps='
     '"application/x-rtp,media=video,encoding-name=H264,payload=96,clock-rate=90000,packetization-mode=1" '
-    '! rtpjitterbuffer latency=50 ! rtph264depay ! h264parse ! d3d11h264dec ! autovideosink sync=false'
+    '! rtpjitterbuffer latency=50 ! rtph264depay ! h264parse ! d3d11h264dec '
+    # Newest frame wins: if the sink stalls, stale decoded frames are dropped instead of queueing up latency
+    '! queue max-size-buffers=1 max-size-bytes=0 max-size-time=0 leaky=downstream '
+    '! autovideosink sync=false'
 )
 
+# ============ ROBOT PROTOCOL ============
+# Laptop <-> Pi binary frames - layout MUST match Pi/main.py
+# Everything else (HEARTBEAT, CONFIG_REQUEST, CONFIG_RESPONSE) stays JSON
+MSG_CONTROL = 0x01
+MSG_STATUS = 0x02
+CONTROL_FRAME = struct.Struct('<BffffBB')   # type, vx, vy, vr, speed, flags, gpio bits (bit i = GPIO i+1)
+STATUS_FRAME = struct.Struct('<BBBfHiHH')   # type, flags, hit_by_team, time_remaining, total_hits, points, kills, deaths
+
+# CONTROL flags
+CTRL_FIRE = 0x01
+CTRL_ESTOP = 0x02
+CTRL_SERVO1 = 0x04  # Set = MAX, clear = MIN
+CTRL_SERVO2 = 0x08
+CTRL_LIGHTS = 0x10
+
+# STATUS flags
+STAT_FIRE_SUCCESS = 0x01
+STAT_IS_HIT = 0x02
+STAT_GAME_ACTIVE = 0x04
+STAT_IS_READY = 0x08
+STAT_CAMERA_ACTIVE = 0x10
+
+# Constant JSON messages, encoded once
+HEARTBEAT_MSG = json.dumps({'type': 'HEARTBEAT'}).encode('utf-8')
+
+# Disabled state is written by the robot and GV listener threads and read by the
+# control loop and GUI. It is published as one immutable snapshot (rebinding is
+# atomic), so a reader never sees is_disabled from one update and the rest from another.
+DisabledState = namedtuple('DisabledState', 'is_disabled disabled_by disabled_until')
+NOT_DISABLED = DisabledState(False, "", 0)
+
 
 class Config:
     """Configuration manager - receives config from Pi over UDP"""
     
+    __slots__ = ('data', 'robot_ip', 'controls', 'config_received')
+    
     def __init__(self, robot_ip: str = None):
         """Initialize config - will request from Pi"""
         self.data = None  # Will be populated by Pi
@@ -170,6 +221,15 @@ class Config:
 class KeyboardController:
     """Keyboard input handler for WASD controls"""
     
+    # Read every control cycle - fixed attribute layout, no per-instance __dict__
+    __slots__ = (
+        'config', 'keys_pressed', 'vx', 'vy', 'vr', 'boost',
+        'servo1_at_max', 'servo2_at_max', 'gpio_states', 'lights_on',
+        'last_fire_time', 'fire_cooldown', '_dirty', '_state', 'changed', 'toggled', '_pending_release',
+        '_key_forward', '_key_backward', '_key_left', '_key_right', '_key_boost', '_key_fire',
+        '_key_gpio', '_key_lights', '_keys_servo1', '_keys_servo2', '_base_speed', '_boost_speed',
+    )
+    
     def __init__(self, config: Config):
         self.config = config
         
@@ -190,24 +250,71 @@ class KeyboardController:
         self.gpio_states = [False, False, False, False]
         self.lights_on = False
         
-        # Fire cooldown (match Pi's 2s weapon cooldown)
+        # Fire cooldown (match Pi's 2s weapon cooldown), time.monotonic() based
         self.last_fire_time = 0
         self.fire_cooldown = 2.0  # 2000ms to match Pi's IR weapon cooldown
         
+        # update() result is reused until a key event (or invalidate()) changes something
+        self._dirty = True
+        self._state = None
+        self.changed = threading.Event()  # Set with _dirty - wakes the control loop early
+        self.toggled = None  # Optional Event set when a toggle key flips displayed state (servo/lights/GPIO)
+        
+        # key -> Tk after() id of a release not yet applied (see on_key_release)
+        self._pending_release = {}
+        
+        # Key bindings resolved from config once, not on every key event/update
+        self.reload_bindings()
+        
+    def reload_bindings(self):
+        """Resolve key bindings and speeds from config.controls"""
+        controls = self.config.get('controls')
+        self._key_forward = controls.get('forward', 'w')
+        self._key_backward = controls.get('backward', 's')
+        self._key_left = controls.get('left', 'a')
+        self._key_right = controls.get('right', 'd')
+        self._key_boost = controls.get('boost', 'shift_l')
+        self._key_fire = controls.get('fire', 'space')
+        self._key_gpio = [controls.get(f'gpio{i+1}_toggle', '') for i in range(4)]
+        self._key_lights = controls.get('lights_toggle', '')
+        self._keys_servo1 = (controls.get('servo1_up', 'q'), controls.get('servo1_down', 'z'))
+        self._keys_servo2 = (controls.get('servo2_up', 'e'), controls.get('servo2_down', 'c'))
+        self._base_speed = controls.get('base_speed')
+        self._boost_speed = controls.get('boost_speed')
+        
     def on_key_press(self, event):
         """Handle key press"""
         key = self.normalize_key(event.keysym.lower())
+        
+        # Press right after a release of the same key is autorepeat - the key never went up
+        after_id = self._pending_release.pop(key, None)
+        if after_id is not None:
+            event.widget.after_cancel(after_id)
+            return
+        
         if key not in self.keys_pressed:
             self.keys_pressed.add(key)
             
             # Handle toggle keys immediately
-            self._handle_toggle_key(key)
+            if self._handle_toggle_key(key) and self.toggled is not None:
+                self.toggled.set()
+            self._dirty = True
+            self.changed.set()
     
     def on_key_release(self, event):
-        """Handle key release"""
+        """Handle key release - applied after a short debounce so autorepeat doesn't flap the key"""
         key = self.normalize_key(event.keysym.lower())
+        if key in self.keys_pressed and key not in self._pending_release:
+            self._pending_release[key] = event.widget.after(
+                KEY_RELEASE_DEBOUNCE_MS, self._apply_release, key)
+    
+    def _apply_release(self, key):
+        """Debounced half of on_key_release (runs on the Tk thread)"""
+        self._pending_release.pop(key, None)
         if key in self.keys_pressed:
             self.keys_pressed.remove(key)
+            self._dirty = True
+            self.changed.set()
     
     def normalize_key(self, key):
         """Normalize key names"""
@@ -216,41 +323,58 @@ class KeyboardController:
             return 'shift_l'
         return key
     
-    def _handle_toggle_key(self, key):
-        """Handle toggle keys (GPIO, lights, and SERVOS)"""
-        controls = self.config.get('controls')
+    def _handle_toggle_key(self, key) -> bool:
+        """Handle toggle keys (GPIO, lights, and SERVOS) - returns True if one was toggled"""
+        toggled = False
         
         # GPIO toggles
         for i in range(4):
-            if key == controls.get(f'gpio{i+1}_toggle', ''):
+            if key == self._key_gpio[i]:
                 self.gpio_states[i] = not self.gpio_states[i]
+                toggled = True
                 print(f"[Keyboard] GPIO{i+1} = {self.gpio_states[i]}")
         
         # Lights toggle
-        if key == controls.get('lights_toggle', ''):
+        if key == self._key_lights:
             self.lights_on = not self.lights_on
+            toggled = True
             print(f"[Keyboard] Lights = {self.lights_on}")
         
         # SERVO TOGGLES - Q/Z for servo1, E/C for servo2
-        if key == controls.get('servo1_up', 'q'):
+        if key == self._keys_servo1[0]:
             self.servo1_at_max = not self.servo1_at_max
+            toggled = True
             print(f"[Keyboard] Servo1 toggled to {'MAX' if self.servo1_at_max else 'MIN'}")
         
-        if key == controls.get('servo1_down', 'z'):
+        if key == self._keys_servo1[1]:
             self.servo1_at_max = not self.servo1_at_max
+            toggled = True
             print(f"[Keyboard] Servo1 toggled to {'MAX' if self.servo1_at_max else 'MIN'}")
         
-        if key == controls.get('servo2_up', 'e'):
+        if key == self._keys_servo2[0]:
             self.servo2_at_max = not self.servo2_at_max
+            toggled = True
             print(f"[Keyboard] Servo2 toggled to {'MAX' if self.servo2_at_max else 'MIN'}")
         
-        if key == controls.get('servo2_down', 'c'):
+        if key == self._keys_servo2[1]:
             self.servo2_at_max = not self.servo2_at_max
+            toggled = True
             print(f"[Keyboard] Servo2 toggled to {'MAX' if self.servo2_at_max else 'MIN'}")
+        
+        return toggled
+    
+    def invalidate(self):
+        """Re-read bindings and force the next update() to recompute (after controls were reloaded)"""
+        self.reload_bindings()
+        self._dirty = True
     
     def update(self):
         """Update control state based on pressed keys"""
-        controls = self.config.get('controls')
+        # No key went down or up since the last call - the command can't have changed
+        if not self._dirty:
+            return self._state
+        self._dirty = False  # Cleared before reading so a key event mid-update is not lost
+        keys_pressed = self.keys_pressed
         
         # Reset movement
         self.vx = 0.0
@@ -259,38 +383,38 @@ class KeyboardController:
         self.boost = False
         
         # Check for boost
-        if controls.get('boost', 'shift_l') in self.keys_pressed:
+        if self._key_boost in keys_pressed:
             self.boost = True
         
         # Calculate movement - MECANUM DRIVE
         # W/S = Forward/Backward (vy)
         # A/D = Strafe Left/Right (vx)
         # Arrow Left/Right = Rotate (vr)
-        if controls.get('forward', 'w') in self.keys_pressed:
+        if self._key_forward in keys_pressed:
             self.vy += 1.0  # Forward
-        if controls.get('backward', 's') in self.keys_pressed:
+        if self._key_backward in keys_pressed:
             self.vy -= 1.0  # Backward
-        if controls.get('left', 'a') in self.keys_pressed:
+        if self._key_left in keys_pressed:
             self.vx -= 1.0  # Strafe left
-        if controls.get('right', 'd') in self.keys_pressed:
+        if self._key_right in keys_pressed:
             self.vx += 1.0  # Strafe right
         
         # Rotation with arrow keys
-        if 'left' in self.keys_pressed:  # Arrow left
+        if 'left' in keys_pressed:  # Arrow left
             self.vr -= 1.0  # Rotate counter-clockwise
-        if 'right' in self.keys_pressed:  # Arrow right
+        if 'right' in keys_pressed:  # Arrow right
             self.vr += 1.0  # Rotate clockwise
         
         # Apply speed multiplier
-        speed = self.config.get('controls', 'boost_speed') if self.boost else self.config.get('controls', 'base_speed')
+        speed = self._boost_speed if self.boost else self._base_speed
         self.vx *= speed
         self.vy *= speed
         self.vr *= speed
         
         # Fire handling
-        fire_pressed = controls.get('fire', 'space') in self.keys_pressed
+        fire_pressed = self._key_fire in keys_pressed
         
-        return {
+        self._state = {
             'vx': self.vx,
             'vy': self.vy,
             'vr': self.vr,
@@ -301,14 +425,15 @@ class KeyboardController:
             'gpio': self.gpio_states,
             'lights': self.lights_on
         }
+        return self._state
     
-    def can_fire(self):
-        """Check if enough time has passed to fire again"""
-        return time.time() - self.last_fire_time >= self.fire_cooldown
+    def can_fire(self, now: float):
+        """Check if enough time has passed to fire again (now = caller's time.monotonic())"""
+        return now - self.last_fire_time >= self.fire_cooldown
     
-    def fire_executed(self):
+    def fire_executed(self, now: float):
         """Mark that a fire command was executed"""
-        self.last_fire_time = time.time()
+        self.last_fire_time = now
 
 
 class RobotControlGUI:
@@ -319,6 +444,9 @@ class RobotControlGUI:
         self.root.title("🤖 Robot Control - WASD Edition")
         self.root.geometry("800x700")
         self.root.configure(bg='#1a1a1a')
+        self._root_bg = '#1a1a1a'
+        self._label_vars = {}  # label -> StringVar driving its text (see _make_var_label)
+        self._label_cache = {}  # label -> (text, fg) last applied by update_gui
         
         # Get robot IP from user at startup
         robot_ip = self.prompt_robot_ip()
@@ -334,31 +462,49 @@ class RobotControlGUI:
         self.ready_status = False
         self.game_active = False
         self.game_time_remaining = 0
+        self.game_end_time = 0  # time.monotonic() deadline while a game is running
         
-        # Disabled state
-        self.is_disabled = False
-        self.disabled_by = ""
-        self.disabled_until = 0
+        # Disabled state (disabled_until is wall clock; remaining is GUI-only)
+        self.disabled = NOT_DISABLED
         self.disabled_time_remaining = 0
         
         # Network
         self.robot_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.robot_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+        self.robot_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+        self._robot_addr = None  # (ip, port) robot_sock is connected to once config arrives
+        self._rx_buf = bytearray(4096)  # Reused by robot_listener_loop (recvfrom_into)
+        self._rx_view = memoryview(self._rx_buf)
+        self._last_status = b''  # Raw bytes of the last STATUS frame handled
         self.gv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._control_buf = bytearray(CONTROL_FRAME.size)  # Last CONTROL frame, packed in place
+        self._control_view = memoryview(self._control_buf)
+        self._packed_control_key = None  # (vx, vy, vr, flags, gpio_bits) currently packed in _control_buf
+        self._last_control_key = None  # ...and last successfully sent (coalesces unchanged commands)
+        self._last_control_send = 0.0
+        self.send_rate_hz = IDLE_SEND_HZ  # Current control loop rate (shown in the GUI)
+        self._send_errors = 0  # Consecutive failed sends to robot
+        self._send_retry_at = 0.0  # time.monotonic() before which sends are skipped while failing
         
         # Stats
         self.robot_connected = False
         self.gv_connected = False
-        self.last_heartbeat = 0
+        self.last_heartbeat = 0  # time.monotonic() of last robot heartbeat
         self.points = 0
         self.hits_taken = 0
         self.shots_fired = 0
         
         # Connection tracking
-        self.last_gv_contact = 0
+        self.last_gv_contact = 0  # time.monotonic() of last GV message (0 = never)
         
         # Video stream
         self.video_process: Optional[subprocess.Popen] = None
         
+        # Set by the network threads when displayed state changes; update_gui redraws on it
+        self._status_dirty = threading.Event()
+        self._last_draw = 0.0
+        self.keyboard.toggled = self._status_dirty  # Servo/lights toggles are shown in the GUI too
+        
         # Threading
         self.running = True
         self.control_thread = None
@@ -450,17 +596,22 @@ class RobotControlGUI:
         self.robot_listener_thread.start()
         
         # Wait for response (will be handled in robot_listener_loop)
-        start_time = time.time()
+        start_time = time.monotonic()
         while not self.config.config_received:
             time.sleep(0.1)
             self.root.update()  # Keep GUI responsive
-            if time.time() - start_time > CONFIG_REQUEST_TIMEOUT:
+            if time.monotonic() - start_time > CONFIG_REQUEST_TIMEOUT:
                 messagebox.showerror("Configuration Error",
                     f"No response from robot at {self.config.robot_ip}\n"
                     "Make sure the robot is running and on the network.")
                 sys.exit(1)
         
         print("[Config] ✅ Configuration received successfully!")
+        
+        # Every later robot message goes to this one peer - connect once so send()
+        # skips per-call address handling (and the kernel drops datagrams from anyone else)
+        self._robot_addr = (self.config.get_robot_ip(), self.config.get_robot_port())
+        self.robot_sock.connect(self._robot_addr)
     
     def setup_gui(self):
         """Create GUI"""
@@ -499,8 +650,8 @@ class RobotControlGUI:
                              bg='#2a2a2a', fg='white', padx=10, pady=10)
         frame.pack(fill='x', pady=5)
         
-        self.mode_label = tk.Label(frame, text="DEBUG MODE",
-                                   font=('Arial', 16, 'bold'), bg='#2a2a2a', fg='#ffaa00')
+        self.mode_label = self._make_var_label(frame, "DEBUG MODE",
+                                               font=('Arial', 16, 'bold'), bg='#2a2a2a', fg='#ffaa00')
         self.mode_label.pack()
         
         mode_info = tk.Label(frame, text="Test your robot freely\nReady up to join the game",
@@ -538,16 +689,16 @@ class RobotControlGUI:
                                              bg='#ff0000', fg='white')
         self.disabled_status_label.pack()
         
-        self.disabled_by_label = tk.Label(self.disabled_frame, 
-                                         text="Disabled by: Unknown",
-                                         font=('Arial', 12), 
-                                         bg='#ff0000', fg='white')
+        self.disabled_by_label = self._make_var_label(self.disabled_frame, 
+                                                     "Disabled by: Unknown",
+                                                     font=('Arial', 12), 
+                                                     bg='#ff0000', fg='white')
         self.disabled_by_label.pack(pady=5)
         
-        self.disabled_timer_label = tk.Label(self.disabled_frame, 
-                                            text="00:00",
-                                            font=('Arial', 32, 'bold'), 
-                                            bg='#ff0000', fg='white')
+        self.disabled_timer_label = self._make_var_label(self.disabled_frame, 
+                                                        "00:00",
+                                                        font=('Arial', 32, 'bold'), 
+                                                        bg='#ff0000', fg='white')
         self.disabled_timer_label.pack(pady=10)
         
         self.disabled_info_label = tk.Label(self.disabled_frame, 
@@ -587,16 +738,16 @@ class RobotControlGUI:
                              bg='#2a2a2a', fg='white', padx=10, pady=10)
         frame.pack(fill='x', pady=5)
         
-        self.game_status_label = tk.Label(frame, text="WAITING FOR GAME",
-                                          font=('Arial', 14, 'bold'), bg='#2a2a2a', fg='#888888')
+        self.game_status_label = self._make_var_label(frame, "WAITING FOR GAME",
+                                                      font=('Arial', 14, 'bold'), bg='#2a2a2a', fg='#888888')
         self.game_status_label.pack()
         
-        self.timer_label = tk.Label(frame, text="--:--",
-                                    font=('Arial', 24, 'bold'), bg='#2a2a2a', fg='#ffffff')
+        self.timer_label = self._make_var_label(frame, "--:--",
+                                                font=('Arial', 24, 'bold'), bg='#2a2a2a', fg='#ffffff')
         self.timer_label.pack(pady=5)
         
-        self.points_label = tk.Label(frame, text="Points: 0",
-                                     font=('Arial', 16, 'bold'), bg='#2a2a2a', fg='#ffff00')
+        self.points_label = self._make_var_label(frame, "Points: 0",
+                                                 font=('Arial', 16, 'bold'), bg='#2a2a2a', fg='#ffff00')
         self.points_label.pack()
     
     def create_connection_frame(self, parent):
@@ -605,13 +756,17 @@ class RobotControlGUI:
                              bg='#2a2a2a', fg='white', padx=10, pady=10)
         frame.pack(fill='x', pady=5)
         
-        self.robot_status = tk.Label(frame, text="🔴 Robot: Disconnected",
-                                     font=('Arial', 10), bg='#2a2a2a', fg='#ff0000')
+        self.robot_status = self._make_var_label(frame, "🔴 Robot: Disconnected",
+                                                 font=('Arial', 10), bg='#2a2a2a', fg='#ff0000')
         self.robot_status.pack(anchor='w')
         
-        self.gv_status = tk.Label(frame, text="🔴 Game Viewer: Disconnected",
-                                 font=('Arial', 10), bg='#2a2a2a', fg='#ff0000')
+        self.gv_status = self._make_var_label(frame, "🔴 Game Viewer: Disconnected",
+                                             font=('Arial', 10), bg='#2a2a2a', fg='#ff0000')
         self.gv_status.pack(anchor='w')
+        
+        self.send_rate_label = self._make_var_label(frame, f"📡 Send rate: {IDLE_SEND_HZ} Hz (idle)",
+                                                    font=('Arial', 10), bg='#2a2a2a', fg='#aaaaaa')
+        self.send_rate_label.pack(anchor='w')
     
     def create_stats_frame(self, parent):
         """Stats frame"""
@@ -619,12 +774,12 @@ class RobotControlGUI:
                              bg='#2a2a2a', fg='white', padx=10, pady=10)
         frame.pack(fill='x', pady=5)
         
-        self.shots_label = tk.Label(frame, text="Shots Fired: 0",
-                                    font=('Arial', 10), bg='#2a2a2a', fg='#aaaaaa')
+        self.shots_label = self._make_var_label(frame, "Shots Fired: 0",
+                                                font=('Arial', 10), bg='#2a2a2a', fg='#aaaaaa')
         self.shots_label.pack(anchor='w')
         
-        self.hits_label = tk.Label(frame, text="Hits Taken: 0",
-                                   font=('Arial', 10), bg='#2a2a2a', fg='#aaaaaa')
+        self.hits_label = self._make_var_label(frame, "Hits Taken: 0",
+                                               font=('Arial', 10), bg='#2a2a2a', fg='#aaaaaa')
         self.hits_label.pack(anchor='w')
     
     def create_controls_info_frame(self, parent):
@@ -663,14 +818,14 @@ GPIO:
         
         tk.Label(servo_frame, text="Servo 1:", font=('Arial', 9),
                 bg='#2a2a2a', fg='#aaaaaa').grid(row=0, column=0, sticky='w')
-        self.servo1_label = tk.Label(servo_frame, text="MIN", font=('Arial', 9, 'bold'),
-                                     bg='#2a2a2a', fg='#00ff00')
+        self.servo1_label = self._make_var_label(servo_frame, "MIN", font=('Arial', 9, 'bold'),
+                                                 bg='#2a2a2a', fg='#00ff00')
         self.servo1_label.grid(row=0, column=1, sticky='w', padx=5)
         
         tk.Label(servo_frame, text="Servo 2:", font=('Arial', 9),
                 bg='#2a2a2a', fg='#aaaaaa').grid(row=1, column=0, sticky='w')
-        self.servo2_label = tk.Label(servo_frame, text="MIN", font=('Arial', 9, 'bold'),
-                                     bg='#2a2a2a', fg='#00ff00')
+        self.servo2_label = self._make_var_label(servo_frame, "MIN", font=('Arial', 9, 'bold'),
+                                                 bg='#2a2a2a', fg='#00ff00')
         self.servo2_label.grid(row=1, column=1, sticky='w', padx=5)
     
     def create_video_frame(self, parent):
@@ -728,7 +883,7 @@ GPIO:
                     break
                 
                 # ONLY re-register if we've lost connection (no heartbeat for 15+ seconds)
-                current_time = time.time()
+                current_time = time.monotonic()
                 if not self.gv_connected and self.last_gv_contact > 0:
                     if (current_time - self.last_gv_contact) > 15.0:
                         print("[GV] 🔄 Connection lost - attempting re-registration...")
@@ -745,166 +900,242 @@ GPIO:
         """Listen for status responses from robot"""
         # Use the SAME socket that sends commands (self.robot_sock)
         # This way Pi responses come back to the right place
-        self.robot_sock.settimeout(1.0)
+        # Non-blocking: sends never stall the control loop, this thread waits in select()
+        self.robot_sock.setblocking(False)
         
         last_response_time = 0
         
         while self.running:
             try:
-                data, addr = self.robot_sock.recvfrom(4096)
-                message = json.loads(data.decode('utf-8'))
-                
-                msg_type = message.get('type')
+                readable, _, _ = select.select([self.robot_sock], [], [], 1.0)
                 
-                # Update connection status for ANY message from robot
-                current_time = time.time()
-                self.robot_connected = True
-                last_response_time = current_time
-                
-                # Handle config response
-                if msg_type == 'CONFIG_RESPONSE':
-                    config_data = message.get('config')
-                    if config_data:
-                        self.config.set_robot_config(config_data)
+                if not readable:
+                    # Check if connection timed out
+                    if time.monotonic() - last_response_time > 3.0:
+                        if self.robot_connected:  # Only print once
+                            print("[Robot] ⚠️ Connection timeout")
+                            self.robot_connected = False
+                            self._status_dirty.set()
                     continue
                 
-                # Handle STATUS response with fire confirmation
-                if msg_type == 'STATUS':
-                    # Only count shot if Pi confirms fire actually happened
-                    if message.get('fire_success', False):
-                        self.shots_fired += 1
-                        print(f"[Robot] 🔥 Shot fired! Total: {self.shots_fired}")
-                    
-                    # CHECK IR STATUS FROM PI - SYNC DISABLED STATE!
-                    # This works TOGETHER with GV's ROBOT_DISABLED message
-                    # Pi is the SOURCE OF TRUTH for hit state, GV handles scoring
-                    ir_status = message.get('ir_status', {})
-                    if ir_status:
-                        pi_is_hit = ir_status.get('is_hit', False)
-                        time_remaining = ir_status.get('time_remaining', 0)
-                        
-                        # If Pi says we're hit but laptop doesn't know - SYNC IT!
-                        if pi_is_hit and not self.is_disabled:
-                            hit_by_team = ir_status.get('hit_by_team', 0)
-                            
-                            print(f"[Robot] 💥 SYNCING DISABLED STATE from Pi! Hit by Team {hit_by_team}, {time_remaining:.1f}s remaining")
-                            self.is_disabled = True
-                            self.disabled_by = f"Team {hit_by_team}"
-                            self.disabled_until = time.time() + time_remaining
-                            # Don't increment hits_taken here - GV will send POINTS_UPDATE with deaths count
-                        
-                        # If Pi says we're NOT hit but laptop thinks we are - CLEAR IT!
-                        elif not pi_is_hit and self.is_disabled:
-                            print(f"[Robot] ✅ SYNCING ENABLED STATE from Pi - respawned!")
-                            self.is_disabled = False
-                            self.disabled_by = ""
-                            self.disabled_until = 0
-                            self.disabled_time_remaining = 0
+                # Drain everything that arrived in one wakeup
+                while True:
+                    try:
+                        nbytes, addr = self.robot_sock.recvfrom_into(self._rx_buf)
+                    except BlockingIOError:
+                        break
                     
-                    continue
-                
-                # Debug: Print first response
-                if not hasattr(self, '_debug_robot_response'):
-                    self._debug_robot_response = True
-                    print(f"[Robot] ✅ First response received from {addr}")
+                    # Update connection status for ANY message from robot
+                    if not self.robot_connected:
+                        self.robot_connected = True
+                        self._status_dirty.set()
+                    last_response_time = time.monotonic()
                     
-            except socket.timeout:
-                # Check if connection timed out
-                if time.time() - last_response_time > 3.0:
-                    if self.robot_connected:  # Only print once
-                        print("[Robot] ⚠️ Connection timeout")
-                    self.robot_connected = False
-                continue
+                    if nbytes:
+                        self.handle_robot_message(self._rx_view[:nbytes], addr)
+            
             except Exception as e:
                 if not hasattr(self, '_debug_listener_error'):
                     self._debug_listener_error = True
                     print(f"[Robot] Listener error: {e}")
     
+    def handle_robot_message(self, data: memoryview, addr):
+        """Handle one datagram from the robot (a view into the shared rx buffer - don't keep it)"""
+        # Handle binary STATUS response with fire confirmation
+        if data[0] == MSG_STATUS:
+            # Most frames repeat the previous one - skip those unless they confirm a shot or
+            # disagree with self.disabled (which the GV path also sets - Pi stays the source of truth)
+            if (data == self._last_status and not data[1] & STAT_FIRE_SUCCESS
+                    and bool(data[1] & STAT_IS_HIT) == self.disabled.is_disabled):
+                return
+            self._last_status = bytes(data)
+            (_, flags, hit_by_team, time_remaining,
+             _total_hits, _points, _kills, _deaths) = STATUS_FRAME.unpack_from(data)
+            self.handle_robot_status(flags, hit_by_team, time_remaining)
+            return
+        
+        message = json.loads(str(data, 'utf-8'))
+        msg_type = message.get('type')
+        
+        # Handle config response
+        if msg_type == 'CONFIG_RESPONSE':
+            config_data = message.get('config')
+            if config_data:
+                self.config.set_robot_config(config_data)
+            return
+        
+        # Debug: Print first response
+        if not hasattr(self, '_debug_robot_response'):
+            self._debug_robot_response = True
+            print(f"[Robot] ✅ First response received from {addr}")
+    
+    def handle_robot_status(self, flags: int, hit_by_team: int, time_remaining: float):
+        """Apply a STATUS frame from the Pi"""
+        # Only count shot if Pi confirms fire actually happened
+        if flags & STAT_FIRE_SUCCESS:
+            self.shots_fired += 1
+            self._status_dirty.set()
+            print(f"[Robot] 🔥 Shot fired! Total: {self.shots_fired}")
+        
+        # CHECK IR STATUS FROM PI - SYNC DISABLED STATE!
+        # This works TOGETHER with GV's ROBOT_DISABLED message
+        # Pi is the SOURCE OF TRUTH for hit state, GV handles scoring
+        pi_is_hit = bool(flags & STAT_IS_HIT)
+        
+        disabled = self.disabled
+        
+        # If Pi says we're hit but laptop doesn't know - SYNC IT!
+        if pi_is_hit and not disabled.is_disabled:
+            print(f"[Robot] 💥 SYNCING DISABLED STATE from Pi! Hit by Team {hit_by_team}, {time_remaining:.1f}s remaining")
+            self.disabled = DisabledState(True, f"Team {hit_by_team}", time.time() + time_remaining)
+            self._status_dirty.set()
+            # Don't increment hits_taken here - GV will send POINTS_UPDATE with deaths count
+        
+        # If Pi says we're NOT hit but laptop thinks we are - CLEAR IT!
+        elif not pi_is_hit and disabled.is_disabled:
+            print(f"[Robot] ✅ SYNCING ENABLED STATE from Pi - respawned!")
+            self.disabled = NOT_DISABLED
+            self._status_dirty.set()
+    
     def control_loop(self):
-        """Main control loop - sends commands to robot"""
-        rate = 1.0 / SEND_HZ
+        """Main control loop - sends commands to robot (SEND_HZ while driving, IDLE_SEND_HZ otherwise)"""
+        next_deadline = time.monotonic()
         
         while self.running:
-            start_time = time.time()
+            # One clock read per cycle - cooldown, coalescing and heartbeat all compare against it
+            now = time.monotonic()
+            active = False
             
             try:
                 # Get current control state
                 state = self.keyboard.update()
                 
                 # Check if robot is disabled OR ready but game not started - if so, send stop commands
-                if self.is_disabled or (self.ready_status and not self.game_active):
-                    # Send all-stop command
-                    cmd = {
-                        'type': 'CONTROL',
-                        'vx': 0,
-                        'vy': 0,
-                        'vr': 0,
-                        'servo1_toggle': state['servo1_toggle'],  # Allow servo control when disabled
-                        'servo2_toggle': state['servo2_toggle'],
-                        'gpio': [False, False, False, False],  # Turn off all GPIO
-                        'lights': False  # Turn off lights
-                    }
-                    self.send_to_robot(cmd)
+                if self.disabled.is_disabled or (self.ready_status and not self.game_active):
+                    # Send all-stop command - GPIO and lights off
+                    flags = 0
+                    if state['servo1_toggle']:  # Allow servo control when disabled
+                        flags |= CTRL_SERVO1
+                    if state['servo2_toggle']:
+                        flags |= CTRL_SERVO2
+                    self.send_control(0.0, 0.0, 0.0, flags, 0, now)
                 
                 # Only send controls in debug mode or during active game
                 elif not self.game_mode or (self.game_mode and self.game_active):
                     # Build command
-                    cmd = {
-                        'type': 'CONTROL',
-                        'vx': state['vx'],
-                        'vy': state['vy'],
-                        'vr': state['vr'],
-                        'servo1_toggle': state['servo1_toggle'],
-                        'servo2_toggle': state['servo2_toggle'],
-                        'gpio': state['gpio'],
-                        'lights': state['lights']
-                    }
+                    flags = 0
+                    if state['servo1_toggle']:
+                        flags |= CTRL_SERVO1
+                    if state['servo2_toggle']:
+                        flags |= CTRL_SERVO2
+                    if state['lights']:
+                        flags |= CTRL_LIGHTS
+                    
+                    gpio_bits = 0
+                    for i, gpio_on in enumerate(state['gpio']):
+                        if gpio_on:
+                            gpio_bits |= 1 << i
                     
                     # Handle fire with cooldown (Pi has 2s cooldown, don't count here)
-                    if state['fire'] and self.keyboard.can_fire():
+                    if state['fire'] and self.keyboard.can_fire(now):
                         if not self.game_mode or (self.game_mode and self.game_active):
-                            cmd['fire'] = True
-                            self.keyboard.fire_executed()
+                            flags |= CTRL_FIRE
                             # Don't increment shots here - wait for Pi confirmation via fire_success
                     
-                    # Send to robot
-                    self.send_to_robot(cmd)
+                    # Send to robot - the cooldown only starts once the fire frame is actually out
+                    sent = self.send_control(state['vx'], state['vy'], state['vr'], flags, gpio_bits, now)
+                    if sent and flags & CTRL_FIRE:
+                        self.keyboard.fire_executed(now)
+                    active = bool(state['vx'] or state['vy'] or state['vr'] or state['fire'])
                     
                     # Update heartbeat
-                    if time.time() - self.last_heartbeat > 1.0:
+                    if now - self.last_heartbeat > 1.0:
                         self.send_heartbeat()
-                        self.last_heartbeat = time.time()
+                        self.last_heartbeat = now
             
             except Exception as e:
                 print(f"[Control] Error: {e}")
             
-            # Sleep to maintain rate
-            elapsed = time.time() - start_time
-            sleep_time = max(0, rate - elapsed)
-            time.sleep(sleep_time)
+            # Idle: nothing is moving, so slow down; the 0.25s keepalive still fits in a 10 Hz loop
+            send_rate_hz = SEND_HZ if active else IDLE_SEND_HZ
+            if send_rate_hz != self.send_rate_hz:
+                self.send_rate_hz = send_rate_hz
+                self._status_dirty.set()
+            
+            # Sleep to the next absolute deadline (monotonic - no drift, immune to clock jumps)
+            next_deadline += 1.0 / send_rate_hz
+            sleep_time = next_deadline - time.monotonic()
+            if sleep_time > 0:
+                # A key press/release cuts the wait short so the new command goes out now;
+                # the cadence then restarts from that send
+                if self.keyboard.changed.wait(sleep_time):
+                    self.keyboard.changed.clear()
+                    next_deadline = time.monotonic()
+            else:
+                # Overran a whole period - resync rather than burst to catch up
+                next_deadline = time.monotonic()
+    
+    def send_control(self, vx: float, vy: float, vr: float, flags: int, gpio_bits: int, now: float) -> bool:
+        """Send a binary CONTROL frame to robot (speed scaling is already in vx/vy/vr)
+        
+        Returns True if a frame went out (False if coalesced or the send failed/backed off)
+        """
+        key = (vx, vy, vr, flags, gpio_bits)
+        keepalive = key == self._last_control_key and not flags & CTRL_FIRE
+        if keepalive:
+            # Pi holds the last set-point - an unchanged command only needs a periodic keepalive
+            if now - self._last_control_send < CONTROL_KEEPALIVE_S:
+                return False
+        elif key != self._packed_control_key:
+            # Packed into the one reusable buffer - no new bytes object per command
+            CONTROL_FRAME.pack_into(self._control_buf, 0, MSG_CONTROL, vx, vy, vr, 1.0, flags, gpio_bits)
+            self._packed_control_key = key
+        
+        # Only keepalives are subject to the send-error backoff; a new command or a fire always tries
+        if not self._send_robot_data(self._control_view, 'CONTROL', backoff=keepalive):
+            return False
+        self._last_control_key = key
+        self._last_control_send = now
+        return True
     
     def send_to_robot(self, message):
-        """Send message to robot"""
+        """Send JSON message to robot"""
+        self._send_robot_data(json.dumps(message).encode('utf-8'), message.get('type', 'UNKNOWN'))
+    
+    def _send_robot_data(self, data, msg_type: str, backoff: bool = False) -> bool:
+        """Send an encoded message (any bytes-like object) to robot - returns True if sent
+        
+        backoff=True marks periodic traffic (keepalives) that is skipped while sends are failing.
+        """
+        # Robot unreachable (send() raised) - retry keepalives at 2 Hz instead of failing every tick
+        if backoff and self._send_errors and time.monotonic() < self._send_retry_at:
+            return False
         try:
-            data = json.dumps(message).encode('utf-8')
-            robot_ip = self.config.get_robot_ip()
-            robot_port = self.config.get_robot_port()
-            self.robot_sock.sendto(data, (robot_ip, robot_port))
+            self.robot_sock.send(data)
+            if self._send_errors:
+                print(f"[Network] Send to robot recovered after {self._send_errors} failure(s)")
+                self._send_errors = 0
             
             # Debug: Print first message of each type
-            msg_type = message.get('type', 'UNKNOWN')
             if not hasattr(self, '_debug_sent_types'):
                 self._debug_sent_types = set()
             if msg_type not in self._debug_sent_types:
                 self._debug_sent_types.add(msg_type)
-                print(f"[Network] First {msg_type} sent to {robot_ip}:{robot_port}")
+                print(f"[Network] First {msg_type} sent to {self._robot_addr[0]}:{self._robot_addr[1]}")
+            return True
                 
         except Exception as e:
-            print(f"[Network] Failed to send to robot: {e}")
+            self._send_errors += 1
+            self._send_retry_at = time.monotonic() + SEND_ERROR_BACKOFF_S
+            if self._send_errors == 1:  # Once per outage, not on every retry
+                print(f"[Network] Failed to send to robot: {e} - retrying keepalives every {SEND_ERROR_BACKOFF_S}s")
+            elif not backoff:  # One-shot messages are worth a line each
+                print(f"[Network] Failed to send {msg_type} to robot: {e}")
+            return False
     
     def send_heartbeat(self):
         """Send heartbeat to robot"""
-        self.send_to_robot({'type': 'HEARTBEAT'})
+        self._send_robot_data(HEARTBEAT_MSG, 'HEARTBEAT', backoff=True)
     
     # ============ GAME VIEWER COMMUNICATION ============
     
@@ -933,8 +1164,8 @@ GPIO:
             return
         
         # Start with current time to avoid immediate timeout
-        self.last_gv_contact = time.time()
-        last_gv_message_time = time.time()
+        self.last_gv_contact = time.monotonic()
+        last_gv_message_time = time.monotonic()
         
         while self.running:
             try:
@@ -943,8 +1174,8 @@ GPIO:
                 
                 # Update GV connection status
                 self.gv_connected = True
-                self.last_gv_contact = time.time()  # Track last contact time
-                last_gv_message_time = time.time()
+                self.last_gv_contact = time.monotonic()  # Track last contact time
+                last_gv_message_time = time.monotonic()
                 
                 # Debug: Print first GV message
                 if not hasattr(self, '_debug_gv_msg'):
@@ -955,7 +1186,7 @@ GPIO:
             except socket.timeout:
                 # Check if GV connection timed out (no messages for 10+ seconds)
                 # GV sends heartbeats every 1 second, so 10s is very generous
-                if time.time() - last_gv_message_time > 10.0:
+                if time.monotonic() - last_gv_message_time > 10.0:
                     if self.gv_connected:  # Only print once when transitioning
                         print("[GV] ⚠️ Connection timeout - no messages for 10+ seconds")
                     self.gv_connected = False
@@ -990,7 +1221,11 @@ GPIO:
         msg_type = message.get('type')
         
         # Update last contact time for any message from GV
-        self.last_gv_contact = time.time()
+        self.last_gv_contact = time.monotonic()
+        
+        # Anything but a keepalive may change what the GUI shows
+        if msg_type != 'HEARTBEAT':
+            self._status_dirty.set()
         
         if msg_type == 'DISCOVERY':
             # Game Viewer is looking for laptops - respond with registration
@@ -1060,6 +1295,7 @@ GPIO:
             self.game_mode = True
             self.game_active = True
             self.game_time_remaining = duration
+            self.game_end_time = time.monotonic() + duration
             self.points = 0
             self.hits_taken = 0
             self.shots_fired = 0
@@ -1107,25 +1343,22 @@ GPIO:
             # This works TOGETHER with Pi's ir_status sync
             # GV provides team name, Pi provides hit state
             # Only update if we're not already disabled (avoid override)
-            if not self.is_disabled:
-                self.is_disabled = True
-                self.disabled_by = message.get('disabled_by', 'Unknown')
-                self.disabled_until = message.get('disabled_until', 0)
+            disabled = self.disabled
+            if not disabled.is_disabled:
+                disabled_by = message.get('disabled_by', 'Unknown')
+                self.disabled = DisabledState(True, disabled_by, message.get('disabled_until', 0))
                 duration = message.get('duration', 10)
-                print(f"[GV] 💥 DISABLED by {self.disabled_by} for {duration}s!")
+                print(f"[GV] 💥 DISABLED by {disabled_by} for {duration}s!")
             else:
                 # Already disabled from Pi sync - just update the name
                 friendly_name = message.get('disabled_by', 'Unknown')
-                if self.disabled_by.startswith('Team ') and friendly_name != 'Unknown':
-                    self.disabled_by = friendly_name
+                if disabled.disabled_by.startswith('Team ') and friendly_name != 'Unknown':
+                    self.disabled = disabled._replace(disabled_by=friendly_name)
                     print(f"[GV] Updated disabled-by name: {friendly_name}")
         
         elif msg_type == 'ROBOT_ENABLED':
             # Robot has been re-enabled
-            self.is_disabled = False
-            self.disabled_by = ""
-            self.disabled_until = 0
-            self.disabled_time_remaining = 0
+            self.disabled = NOT_DISABLED
             print("[GV] ROBOT RE-ENABLED!")
     
     def toggle_ready(self):
@@ -1151,30 +1384,54 @@ GPIO:
             self.game_mode = False
             self.game_active = False  # Also clear game_active
             print("[GV] Marked as NOT READY - Returning to DEBUG MODE")
+        self._status_dirty.set()
     
     # ============ VIDEO ============
     
     def start_video(self):
-        """Start video stream"""
+        """Start video stream - the process is spawned off the Tk thread so the GUI doesn't stall"""
         if self.video_process:
             return
         
+        self.start_video_btn.config(state='disabled')
+        threading.Thread(target=self._launch_video, daemon=True).start()
+    
+    def _launch_video(self):
+        """Spawn the GStreamer receiver (short-lived thread), then report back on the Tk thread"""
         try:
             port = self.config.get_video_port()
-            cmd = GST_RECEIVER_CMD_TEMPLATE.format(port=port)
-            self.video_process = subprocess.Popen(cmd, shell=True)
-            
-            self.video_status_label.config(text="Stream: Running", fg='#00ff00')
-            self.start_video_btn.config(state='disabled')
+            # Direct exec, no intermediate shell to spawn (and terminate() reaches gst itself)
+            argv = shlex.split(GST_RECEIVER_CMD_TEMPLATE.format(port=port))
+            if sys.platform == 'win32':
+                # Own process group so stop_video can deliver Ctrl+Break to gst-launch alone
+                self.video_process = subprocess.Popen(argv, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+            else:
+                self.video_process = subprocess.Popen(argv)
             print(f"[Video] Started stream on port {port}")
         except Exception as e:
-            messagebox.showerror("Video Error", f"Failed to start video: {e}")
+            self.root.after(0, self._video_start_failed, e)
+            return
+        
+        self.root.after(0, lambda: self.video_status_label.config(text="Stream: Running", fg='#00ff00'))
+    
+    def _video_start_failed(self, error: Exception):
+        """Tk-thread half of a failed _launch_video"""
+        self.start_video_btn.config(state='normal')
+        messagebox.showerror("Video Error", f"Failed to start video: {error}")
     
     def stop_video(self):
         """Stop video stream"""
         if self.video_process:
-            self.video_process.terminate()
-            self.video_process.wait()
+            # Ask gst-launch to shut down cleanly first so it releases the UDP port promptly
+            if sys.platform == 'win32':
+                self.video_process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                self.video_process.terminate()
+            try:
+                self.video_process.wait(timeout=VIDEO_STOP_TIMEOUT_S)
+            except subprocess.TimeoutExpired:
+                self.video_process.kill()
+                self.video_process.wait()
             self.video_process = None
             
             self.video_status_label.config(text="Stream: Stopped", fg='#888888')
@@ -1184,22 +1441,30 @@ GPIO:
     # ============ GUI UPDATE ============
     
     def update_gui(self):
-        """Update GUI periodically"""
+        """Update GUI periodically - redraws only when state changed, counting down, or keepalive"""
         if not self.running:
             return
         
+        now = time.monotonic()
+        disabled = self.disabled  # One consistent snapshot for this redraw
+        if not (disabled.is_disabled or self._status_dirty.is_set()
+                or now - self._last_draw >= GUI_KEEPALIVE_S):
+            # Nothing changed - back off so an idle window isn't waking up 10x a second
+            self.root.after(GUI_IDLE_POLL_MS, self.update_gui)
+            return
+        self._status_dirty.clear()
+        self._last_draw = now
+        
         # Update disabled state
-        if self.is_disabled:
+        if disabled.is_disabled:
             # Calculate time remaining
             current_time = time.time()
-            self.disabled_time_remaining = max(0, self.disabled_until - current_time)
+            self.disabled_time_remaining = max(0, disabled.disabled_until - current_time)
             
             # CHECK IF TIMER EXPIRED - AUTO RE-ENABLE!
             if self.disabled_time_remaining <= 0:
                 print("[Laptop] ✅ Disabled timer expired - RE-ENABLING ROBOT!")
-                self.is_disabled = False
-                self.disabled_by = ""
-                self.disabled_until = 0
+                self.disabled = NOT_DISABLED
                 self.disabled_time_remaining = 0
             else:
                 # Show disabled frame if not already shown
@@ -1207,13 +1472,13 @@ GPIO:
                     self.disabled_frame.pack(fill='x', pady=5, after=self.mode_label.master)
                 
                 # Update disabled info
-                self.disabled_by_label.config(text=f"Disabled by: {self.disabled_by}")
+                self._set_label(self.disabled_by_label, f"Disabled by: {disabled.disabled_by}")
                 seconds = int(self.disabled_time_remaining)
                 millis = int((self.disabled_time_remaining % 1) * 10)
-                self.disabled_timer_label.config(text=f"{seconds:02d}.{millis:01d}")
+                self._set_label(self.disabled_timer_label, f"{seconds:02d}.{millis:01d}")
                 
                 # Apply red theme to main frames
-                self.root.configure(bg='#330000')
+                self._set_root_bg('#330000')
             
         else:
             # Hide disabled frame if shown
@@ -1221,58 +1486,88 @@ GPIO:
                 self.disabled_frame.pack_forget()
             
             # Restore normal theme
-            self.root.configure(bg='#1a1a1a')
+            self._set_root_bg('#1a1a1a')
         
         # Update connection status
         if self.robot_connected:
-            self.robot_status.config(text="🟢 Robot: Connected", fg='#00ff00')
+            self._set_label(self.robot_status, "🟢 Robot: Connected", '#00ff00')
         else:
-            self.robot_status.config(text="🔴 Robot: Disconnected", fg='#ff0000')
+            self._set_label(self.robot_status, "🔴 Robot: Disconnected", '#ff0000')
         
         if self.gv_connected:
-            self.gv_status.config(text="🟢 Game Viewer: Connected", fg='#00ff00')
+            self._set_label(self.gv_status, "🟢 Game Viewer: Connected", '#00ff00')
+        else:
+            self._set_label(self.gv_status, "🔴 Game Viewer: Disconnected", '#ff0000')
+        
+        if self.send_rate_hz == SEND_HZ:
+            self._set_label(self.send_rate_label, f"📡 Send rate: {SEND_HZ} Hz (active)", '#00ff00')
         else:
-            self.gv_status.config(text="🔴 Game Viewer: Disconnected", fg='#ff0000')
+            self._set_label(self.send_rate_label, f"📡 Send rate: {IDLE_SEND_HZ} Hz (idle)", '#aaaaaa')
         
         # Update mode
         if self.game_active:
-            self.mode_label.config(text="GAME ACTIVE", fg='#ff0000')
-            self.game_status_label.config(text="🔥 IN GAME", fg='#ff0000')
+            self._set_label(self.mode_label, "GAME ACTIVE", '#ff0000')
+            self._set_label(self.game_status_label, "🔥 IN GAME", '#ff0000')
         elif self.ready_status and not self.game_active:
             # Ready but game hasn't started yet (or just ended - WAITING mode)
-            self.mode_label.config(text="WAITING MODE", fg='#ffaa00')
-            self.game_status_label.config(text="⏸️ STANDBY", fg='#ffaa00')
+            self._set_label(self.mode_label, "WAITING MODE", '#ffaa00')
+            self._set_label(self.game_status_label, "⏸️ STANDBY", '#ffaa00')
         elif self.game_mode:
-            self.mode_label.config(text="GAME MODE", fg='#ffaa00')
-            self.game_status_label.config(text="⏳ WAITING", fg='#ffaa00')
+            self._set_label(self.mode_label, "GAME MODE", '#ffaa00')
+            self._set_label(self.game_status_label, "⏳ WAITING", '#ffaa00')
         else:
-            self.mode_label.config(text="DEBUG MODE", fg='#00ff00')
-            self.game_status_label.config(text="🛠️ TESTING", fg='#00ff00')
+            self._set_label(self.mode_label, "DEBUG MODE", '#00ff00')
+            self._set_label(self.game_status_label, "🛠️ TESTING", '#00ff00')
         
         # Update timer
+        if self.game_active:
+            self.game_time_remaining = max(0, self.game_end_time - now)
         if self.game_active and self.game_time_remaining > 0:
-            self.game_time_remaining -= 0.1
             minutes = int(self.game_time_remaining // 60)
             seconds = int(self.game_time_remaining % 60)
-            self.timer_label.config(text=f"{minutes:02d}:{seconds:02d}")
+            self._set_label(self.timer_label, f"{minutes:02d}:{seconds:02d}")
         else:
-            self.timer_label.config(text="--:--")
+            self._set_label(self.timer_label, "--:--")
         
         # Update points
-        self.points_label.config(text=f"Points: {self.points}")
+        self._set_label(self.points_label, f"Points: {self.points}")
         
         # Update stats
-        self.shots_label.config(text=f"Shots Fired: {self.shots_fired}")
-        self.hits_label.config(text=f"Hits Taken: {self.hits_taken}")
+        self._set_label(self.shots_label, f"Shots Fired: {self.shots_fired}")
+        self._set_label(self.hits_label, f"Hits Taken: {self.hits_taken}")
         
         # Update servo positions (show MIN/MAX instead of percentage)
         servo1_pos = "MAX" if self.keyboard.servo1_at_max else "MIN"
         servo2_pos = "MAX" if self.keyboard.servo2_at_max else "MIN"
-        self.servo1_label.config(text=f"{servo1_pos}")
-        self.servo2_label.config(text=f"{servo2_pos}")
+        self._set_label(self.servo1_label, f"{servo1_pos}")
+        self._set_label(self.servo2_label, f"{servo2_pos}")
         
         # Schedule next update
-        self.root.after(100, self.update_gui)
+        self.root.after(GUI_POLL_MS, self.update_gui)
+    
+    def _make_var_label(self, parent, text: str, **options):
+        """Create a Label whose text is driven by a StringVar (updated via _set_label)"""
+        var = tk.StringVar(value=text)
+        label = tk.Label(parent, textvariable=var, **options)
+        self._label_vars[label] = var
+        return label
+    
+    def _set_label(self, label, text: str, fg: Optional[str] = None):
+        """Set a dynamic label - StringVar.set() on text change, config(fg) only on colour change"""
+        last_text, last_fg = self._label_cache.get(label, (None, None))
+        if text != last_text:
+            self._label_vars[label].set(text)
+        if fg is not None and fg != last_fg:
+            label.config(fg=fg)
+        else:
+            fg = last_fg
+        self._label_cache[label] = (text, fg)
+    
+    def _set_root_bg(self, bg: str):
+        """Window background, only reconfigured on change"""
+        if bg != self._root_bg:
+            self._root_bg = bg
+            self.root.configure(bg=bg)
     
     # ============ SETTINGS ============
     
@@ -1282,6 +1577,7 @@ GPIO:
         if dialog.result:
             # Reload controls
             self.config.controls = self.config.load_controls()
+            self.keyboard.invalidate()
             self.team_name_label.config(text=self.config.get_team_name())
             print("[Config] Settings updated")
     
@@ -1311,7 +1607,16 @@ GPIO:
     
     def run(self):
         """Run the application"""
-        self.root.mainloop()
+        # Sleeps/waits on Windows round up to the system timer tick; raise its resolution
+        # for the session so control_loop actually hits its deadlines
+        winmm = ctypes.windll.winmm if sys.platform == 'win32' else None
+        if winmm:
+            winmm.timeBeginPeriod(WINDOWS_TIMER_RES_MS)
+        try:
+            self.root.mainloop()
+        finally:
+            if winmm:
+                winmm.timeEndPeriod(WINDOWS_TIMER_RES_MS)
 
 
 class SettingsDialog:
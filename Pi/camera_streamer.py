@@ -6,10 +6,11 @@ Camera Streamer - Dual GStreamer output to Laptop and Game Viewer
 import subprocess
 import os
 import signal
+import threading
 from typing import Dict, Optional
 
 class CameraStreamer:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, cpus: Optional[set] = None):
         self.camera_config = config['camera']
         self.network_config = config['network']
         self.team_id = config['team']['team_id']
@@ -29,6 +30,12 @@ class CameraStreamer:
         
         self.process: Optional[subprocess.Popen] = None
         self.is_streaming = False
+        self.cpus = cpus  # Cores for the encoder pipeline (None = anywhere)
+        
+        # Set while the pipeline is running - flipped only on start/stop/exit so
+        # the control loop can check liveness without polling the process
+        self._alive_event = threading.Event()
+        self.fast_is_alive = self._alive_event.is_set
     
     def start_stream(self) -> bool:
         """Start camera stream to both laptop and game viewer"""
@@ -66,12 +73,14 @@ class CameraStreamer:
             self.process = subprocess.Popen(
                 cmd,
                 shell=True,
-                preexec_fn=os.setsid,
+                preexec_fn=self._preexec,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL
             )
             
             self.is_streaming = True
+            self._alive_event.set()
+            threading.Thread(target=self._watch_process, args=(self.process,), daemon=True).start()
             print("[Camera] ✅ Streaming started")
             return True
         
@@ -79,12 +88,22 @@ class CameraStreamer:
             print(f"[Camera] ❌ Failed to start stream: {e}")
             return False
     
+    def _preexec(self):
+        """Runs in the child before exec - own session, optional CPU pinning"""
+        os.setsid()
+        if self.cpus:
+            try:
+                os.sched_setaffinity(0, self.cpus)
+            except OSError:
+                pass  # Keep streaming unpinned rather than fail
+    
     def stop_stream(self):
         """Stop camera stream"""
         if not self.is_streaming:
             return
         
         print("[Camera] Stopping stream...")
+        self._alive_event.clear()
         
         if self.process and self.process.poll() is None:
             try:
@@ -102,6 +121,12 @@ class CameraStreamer:
         self.is_streaming = False
         print("[Camera] Stream stopped")
     
+    def _watch_process(self, process: subprocess.Popen):
+        """Clear the alive flag when the pipeline exits on its own"""
+        process.wait()
+        if self.process is process:
+            self._alive_event.clear()
+    
     def restart_stream(self):
         """Restart camera stream"""
         self.stop_stream()
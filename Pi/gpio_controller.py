@@ -117,6 +117,22 @@ class GPIOController:
         self.pi.write(gpio_info['gpio'], 1 if value else 0)
         return True
     
+    def output_mask(self, name: str) -> int:
+        """Bank 1 bit for an output GPIO (0 if not a configured output)"""
+        gpio_info = self.gpios.get(name)
+        if not gpio_info or gpio_info['mode'] != 'output' or gpio_info['gpio'] > 31:
+            return 0
+        return 1 << gpio_info['gpio']
+    
+    def set_gpio_mask(self, mask: int, enable_mask: int):
+        """Set several output GPIOs at once - one pigpiod call per direction"""
+        set_bits = mask & enable_mask
+        clear_bits = ~mask & enable_mask
+        if set_bits:
+            self.pi.set_bank_1(set_bits)
+        if clear_bits:
+            self.pi.clear_bank_1(clear_bits)
+    
     def get_gpio(self, name: str) -> int:
         """Read GPIO value"""
         if name not in self.gpios:
@@ -129,12 +145,15 @@ class GPIOController:
         if name not in self.lights:
             return False
         
-        light = self.lights[name]
+        self.set_light_handle(self.lights[name], state)
+        return True
+    
+    def set_light_handle(self, light: Dict, state: bool):
+        """set_light for a handle from self.lights (skips the name lookup)"""
         # Invert: LOW (0) = ON, HIGH (1) = OFF
         inverted_state = 0 if state else 1
         self.pi.write(light['gpio'], inverted_state)
         light['state'] = 1 if state else 0  # Store logical state
-        return True
     
     def toggle_light(self, name: str) -> bool:
         """Toggle light state"""
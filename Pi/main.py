@@ -4,14 +4,18 @@ Main Robot Control System
 Competition Laser Tag Robot - Complete Integration
 """
 
-import asyncio
+import gc
+import os
 import pigpio
+import selectors
 import signal
 import socket
+import struct
 import sys
+import threading
 import time
 import json
-from typing import Optional
+from typing import Dict, Optional
 
 # Import all controllers
 from config_manager import ConfigManager
@@ -22,6 +26,50 @@ from gpio_controller import GPIOController
 from camera_streamer import CameraStreamer
 from game_client import GameClient
 
+MOTOR_TICK_S = 0.02  # 50 Hz motor refresh
+DRIVE_REFRESH_S = 0.2  # Re-run drive() this often even when the command hasn't changed
+STATUS_PERIOD_S = 0.1  # STATUS reply rate to the laptop when nothing changed
+GC_YOUNG_PERIOD_S = 1.0  # Generation-0 collection from the tick thread
+GC_FULL_PERIOD_S = 60.0  # Full collection so cycles promoted past gen 0 still get freed
+
+# CPU pinning (4-core Pi) - see "CPU Pinning" in README.md
+MOTOR_CPUS = {2}  # Motor/IR tick thread
+IO_CPUS = {3}     # Network loop and camera pipeline
+MOTOR_RT_PRIORITY = 20  # SCHED_FIFO priority for the tick thread (needs root; falls back to nice)
+
+
+def pin_current_thread(cpus: set, label: str):
+    """Pin the calling thread to cpus (Linux only; skipped if the cores don't exist)"""
+    if not hasattr(os, 'sched_setaffinity') or max(cpus) >= (os.cpu_count() or 1):
+        return
+    try:
+        os.sched_setaffinity(0, cpus)
+        print(f"[System] {label} pinned to CPU {sorted(cpus)}")
+    except OSError as e:
+        print(f"[System] ⚠️ Could not pin {label}: {e}")
+
+
+# Laptop <-> Pi binary frames - layout MUST match Laptop/laptop_control.py
+# Everything else (HEARTBEAT, CONFIG_REQUEST, GAME_*) stays JSON, which always starts with '{'
+MSG_CONTROL = 0x01
+MSG_STATUS = 0x02
+CONTROL_FRAME = struct.Struct('<BffffBB')   # type, vx, vy, vr, speed, flags, gpio bits (bit i = gpio_{i+1})
+STATUS_FRAME = struct.Struct('<BBBfHiHH')   # type, flags, hit_by_team, time_remaining, total_hits, points, kills, deaths
+
+# CONTROL flags
+CTRL_FIRE = 0x01
+CTRL_ESTOP = 0x02
+CTRL_SERVO1 = 0x04  # Set = MAX, clear = MIN
+CTRL_SERVO2 = 0x08
+CTRL_LIGHTS = 0x10
+
+# STATUS flags
+STAT_FIRE_SUCCESS = 0x01
+STAT_IS_HIT = 0x02
+STAT_GAME_ACTIVE = 0x04
+STAT_IS_READY = 0x08
+STAT_CAMERA_ACTIVE = 0x10
+
 class RobotSystem:
     """Main robot control system"""
     
@@ -63,9 +111,41 @@ class RobotSystem:
         self.last_input_time = 0.0
         self.in_standby = False
         
+        # Motor tick thread (started by control_loop)
+        self._motor_thread: Optional[threading.Thread] = None
+        
+        # Set by the signal handler (or cleanup) - ends the control loop and tick thread
+        self._stop = threading.Event()
+        
+        # Last applied actuator outputs - skip pigpiod calls when unchanged
+        self._last_servo1 = None
+        self._last_servo2 = None
+        self._last_gpio_bits = None
+        self._last_lights = None
+        
         # Network
         self.laptop_sock = None
+        self.sel = selectors.DefaultSelector()  # Socket readiness for the control loop
         self.laptop_ip = None  # Will be set from first laptop message
+        self._rx_buf = bytearray(1024)  # Reused for every laptop datagram
+        self._rx_view = memoryview(self._rx_buf)  # Zero-copy slices of _rx_buf
+        self._status_buf = bytearray(STATUS_FRAME.size)  # STATUS reply, packed in place
+        self._last_status_send = 0.0
+        self._status_dirty = True  # Hit/game state changed - network loop pushes a STATUS right away
+        self._laptop_addr = None  # Where STATUS goes (source address of the last CONTROL)
+        
+        # One-shot debug prints
+        self._debug_first_msg = False
+        self._debug_error_printed = False
+        self._debug_tick_error_printed = False
+        
+        # Laptop message handlers, keyed by message type (CONTROL is coalesced per tick)
+        self._handlers = {
+            'CONFIG_REQUEST': self._handle_config_request,
+            'HEARTBEAT': self._handle_heartbeat,
+            'GAME_START': self._handle_game_start,
+            'GAME_END': self._handle_game_end,
+        }
         
         # Initialize all systems
         self.initialize_systems()
@@ -103,8 +183,24 @@ class RobotSystem:
         # GPIO controller
         self.gpio_controller = GPIOController(self.pi, self.config)
         
+        # Bank 1 bits for the laptop's four GPIO toggles, indexed by CONTROL gpio bits
+        pin_masks = [self.gpio_controller.output_mask(f'gpio_{i + 1}') for i in range(4)]
+        self._gpio_bit_masks = []
+        for bits in range(16):
+            mask = 0
+            for i in range(4):
+                if bits & (1 << i):
+                    mask |= pin_masks[i]
+            self._gpio_bit_masks.append(mask)
+        self._gpio_enable_mask = self._gpio_bit_masks[15]
+        
+        # Status light handles (None if not configured)
+        self._d1 = self.gpio_controller.lights.get('d1')
+        self._d2 = self.gpio_controller.lights.get('d2')
+        
         # Camera streamer
-        self.camera_streamer = CameraStreamer(self.config)
+        cpu_count = os.cpu_count() or 1
+        self.camera_streamer = CameraStreamer(self.config, IO_CPUS if max(IO_CPUS) < cpu_count else None)
         
         # DON'T start camera yet - wait for laptop to connect first
         # Camera will auto-start when laptop IP is detected
@@ -126,15 +222,25 @@ class RobotSystem:
     
     def setup_laptop_communication(self):
         """Setup UDP socket for laptop communication"""
-        import socket
-        
         self.laptop_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.laptop_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.laptop_sock.settimeout(0.001)
+        # Room for a burst of commands if a tick runs late (kernel may cap this at rmem_max)
+        self.laptop_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 262144)
+        self.laptop_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 262144)
+        # Mark STATUS replies as low-latency traffic (Linux only - best effort)
+        try:
+            self.laptop_sock.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, 6)  # Interactive qdisc band
+            self.laptop_sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, 0xB8)  # DSCP EF (46)
+        except (AttributeError, OSError) as e:
+            print(f"[System] ⚠️ Could not set socket priority: {e}")
+        self.laptop_sock.setblocking(False)  # Drained until empty each tick
         
         listen_port = self.config['network']['robot_listen_port']
         self.laptop_sock.bind(('0.0.0.0', listen_port))
         
+        # Readable -> drain laptop commands; the game client keeps its own thread
+        self.sel.register(self.laptop_sock, selectors.EVENT_READ, self.process_laptop_command)
+        
         print(f"[System] Listening for laptop commands on port {listen_port}")
     
     def on_robot_hit(self):
@@ -146,28 +252,33 @@ class RobotSystem:
         
         # Update game client stats
         self.game_client.deaths += 1
+        self._status_dirty = True
         
         # Flash lights if configured
-        if 'd1' in self.gpio_controller.lights:
-            self.gpio_controller.toggle_light('d1')
+        if self._d1 is not None:
+            self.gpio_controller.set_light_handle(self._d1, not self._d1['state'])
+            self._last_lights = None  # Next CONTROL re-applies laptop's light state
     
     def on_game_start(self):
         """Called when game starts"""
         print("[System] 🎮 GAME STARTING!")
         self.ir_controller.start_game()
         self.camera_streamer.start_stream()
+        self._status_dirty = True
         
         # Flash lights
-        if 'd1' in self.gpio_controller.lights:
-            self.gpio_controller.set_light('d1', True)
-        if 'd2' in self.gpio_controller.lights:
-            self.gpio_controller.set_light('d2', True)
+        if self._d1 is not None:
+            self.gpio_controller.set_light_handle(self._d1, True)
+        if self._d2 is not None:
+            self.gpio_controller.set_light_handle(self._d2, True)
+        self._last_lights = None
     
     def on_game_end(self):
         """Called when game ends"""
         print("[System] 🏁 GAME ENDED!")
         self.ir_controller.end_game()
         self.motor_controller.stop_all()
+        self._status_dirty = True
         
         # Print stats
         hit_log = self.ir_controller.get_hit_log()
@@ -177,10 +288,11 @@ class RobotSystem:
         print(f"  - K/D: {self.game_client.kills}/{self.game_client.deaths}")
         
         # Turn off lights
-        if 'd1' in self.gpio_controller.lights:
-            self.gpio_controller.set_light('d1', False)
-        if 'd2' in self.gpio_controller.lights:
-            self.gpio_controller.set_light('d2', False)
+        if self._d1 is not None:
+            self.gpio_controller.set_light_handle(self._d1, False)
+        if self._d2 is not None:
+            self.gpio_controller.set_light_handle(self._d2, False)
+        self._last_lights = None
     
     def on_ready_check(self):
         """Called when GV asks if ready - Pi should NOT respond, laptop handles this"""
@@ -190,187 +302,345 @@ class RobotSystem:
     def on_points_update(self, points: int):
         """Called when points are updated"""
         # Could flash lights or do something visual
-        pass
+        self._status_dirty = True
     
-    def process_laptop_command(self):
-        """Process commands from laptop"""
-        try:
-            data, addr = self.laptop_sock.recvfrom(1024)
-            message = json.loads(data.decode('utf-8'))
-            
-            # Update laptop IP from first message and start camera
-            if self.laptop_ip is None:
-                self.laptop_ip = addr[0]
-                print(f"[System] 📡 Laptop connected from {self.laptop_ip}")
-                # Update camera streamer with laptop IP and start streaming
-                if self.camera_streamer:
-                    self.camera_streamer.update_destinations(laptop_ip=self.laptop_ip)
-                    # Now that we have laptop IP, start the stream
-                    if not self.camera_streamer.is_streaming:
-                        print("[Camera] Laptop connected - starting video stream...")
-                        self.camera_streamer.start_stream()
-            
-            msg_type = message.get('type', 'CONTROL')
-            
-            # Handle CONFIG_REQUEST - laptop wants our config
-            if msg_type == 'CONFIG_REQUEST':
-                print(f"[System] 📡 Config request from {addr}")
-                response = {
-                    'type': 'CONFIG_RESPONSE',
-                    'config': self.config
-                }
-                response_data = json.dumps(response).encode('utf-8')
-                self.laptop_sock.sendto(response_data, addr)
-                print(f"[System] ✅ Sent config to laptop")
-                return
-            
-            # Debug: Print first message received
-            if not hasattr(self, '_debug_first_msg'):
-                self._debug_first_msg = True
-                print(f"[System] ✅ First laptop message received from {addr}")
-                print(f"[System] Message type: {msg_type}, keys: {list(message.keys())}")
-            
-            # Handle different message types
-            if msg_type == 'HEARTBEAT':
-                self.last_cmd_time = time.time()
-                return
-            
-            elif msg_type == 'GAME_START':
-                # Game start from laptop (laptop only sends if ready)
-                print("[System] 🎮 GAME_START from laptop!")
-                self.on_game_start()
-                return
-            
-            elif msg_type == 'GAME_END':
-                # Game end from laptop
-                print("[System] 🏁 GAME_END from laptop!")
-                self.on_game_end()
-                return
-            
-            elif msg_type == 'CONTROL':
-                # Update robot state - NEW FORMAT from WASD laptop
-                self.vx = float(message.get('vx', 0))
-                self.vy = float(message.get('vy', 0))
-                self.omega = float(message.get('vr', 0))  # NEW: vr instead of omega
-                self.speed = max(0.0, min(1.0, float(message.get('speed', 1.0))))
-                self.estop = bool(message.get('estop', False))
-                self.fire = bool(message.get('fire', False))
-                
-                self.last_cmd_time = time.time()
-                self.last_input_time = time.time()
-                
-                # Handle servo TOGGLES - NEW FORMAT
-                if 'servo1_toggle' in message:
-                    toggle_state = bool(message['servo1_toggle'])
-                    # Set to MAX or MIN based on toggle state
-                    if toggle_state:
-                        # MAX position
-                        max_pulse = self.servo_controller.servos.get('servo_1', {}).get('max_pulse', 2460)
-                        self.servo_controller.set_servo_pulse('servo_1', max_pulse)
-                    else:
-                        # MIN position
-                        min_pulse = self.servo_controller.servos.get('servo_1', {}).get('min_pulse', 575)
-                        self.servo_controller.set_servo_pulse('servo_1', min_pulse)
-                
-                if 'servo2_toggle' in message:
-                    toggle_state = bool(message['servo2_toggle'])
-                    if toggle_state:
-                        max_pulse = self.servo_controller.servos.get('servo_2', {}).get('max_pulse', 2460)
-                        self.servo_controller.set_servo_pulse('servo_2', max_pulse)
-                    else:
-                        min_pulse = self.servo_controller.servos.get('servo_2', {}).get('min_pulse', 575)
-                        self.servo_controller.set_servo_pulse('servo_2', min_pulse)
+    def process_laptop_command(self, now: float):
+        """Drain all pending laptop commands (now = control loop's monotonic timestamp)"""
+        # Drive commands are set-points - only the newest CONTROL in the batch is applied
+        latest_control = None
+        fire_pending = False
+        
+        while True:
+            try:
+                nbytes, addr = self.laptop_sock.recvfrom_into(self._rx_buf)
+                if nbytes == 0:
+                    continue
+                data = self._rx_buf
                 
-                # Handle GPIO commands - NEW FORMAT (array instead of dict)
-                if 'gpio' in message:
-                    gpio_states = message['gpio']
-                    if isinstance(gpio_states, list) and len(gpio_states) >= 4:
-                        self.gpio_controller.set_gpio('gpio_1', 1 if gpio_states[0] else 0)
-                        self.gpio_controller.set_gpio('gpio_2', 1 if gpio_states[1] else 0)
-                        self.gpio_controller.set_gpio('gpio_3', 1 if gpio_states[2] else 0)
-                        self.gpio_controller.set_gpio('gpio_4', 1 if gpio_states[3] else 0)
+                # Update laptop IP from first message and start camera
+                if self.laptop_ip is None:
+                    self.laptop_ip = addr[0]
+                    print(f"[System] 📡 Laptop connected from {self.laptop_ip}")
+                    # Update camera streamer with laptop IP and start streaming
+                    if self.camera_streamer:
+                        self.camera_streamer.update_destinations(laptop_ip=self.laptop_ip)
+                        # Now that we have laptop IP, start the stream
+                        if not self.camera_streamer.is_streaming:
+                            print("[Camera] Laptop connected - starting video stream...")
+                            self.camera_streamer.start_stream()
                 
-                # Handle light commands - NEW FORMAT (single boolean)
-                if 'lights' in message:
-                    lights_on = bool(message['lights'])
-                    self.gpio_controller.set_light('d1', lights_on)
-                    self.gpio_controller.set_light('d2', lights_on)
+                # Debug: Print first message received
+                if not self._debug_first_msg:
+                    self._debug_first_msg = True
+                    print(f"[System] ✅ First laptop message received from {addr}")
+                    print(f"[System] First byte: {data[0]:#04x}, {nbytes} bytes")
                 
-                # Fire weapon (send actual fire count back to laptop)
-                fire_success = False
-                if self.fire:
-                    fire_success = self.ir_controller.fire()
+                if data[0] == MSG_CONTROL:
+                    if nbytes < CONTROL_FRAME.size:
+                        continue  # Truncated - don't parse stale buffer bytes
+                    control = CONTROL_FRAME.unpack_from(data)
+                    # Don't lose a fire press from a frame we are skipping
+                    if control[5] & CTRL_FIRE:
+                        fire_pending = True
+                    latest_control = (control, addr)
+                    continue
                 
-                # Exit standby if movement detected
-                if self.in_standby and (abs(self.vx) > 0.05 or abs(self.vy) > 0.05 or 
-                                       abs(self.omega) > 0.05 or self.estop):
-                    if not self.ir_controller.is_hit:
-                        self.motor_controller.exit_standby()
-                        self.in_standby = False
+                message = json.loads(str(self._rx_view[:nbytes], 'utf-8'))
+                msg_type = message.get('type')
                 
-                # Send comprehensive status back to laptop (SINGLE MESSAGE)
-                status = {
-                    "type": "STATUS",
-                    "fire_success": fire_success,  # Tell laptop if fire actually happened
-                    "ir_status": self.ir_controller.get_status(),
-                    "game_status": self.game_client.get_status(),
-                    "camera_active": self.camera_streamer.is_alive()
-                }
-                self.laptop_sock.sendto(json.dumps(status).encode('utf-8'), addr)
-        
-        except socket.timeout:
-            # Normal - no data available
-            pass
-        except Exception as e:
-            # Only print first error to avoid spam
-            if not hasattr(self, '_debug_error_printed'):
-                self._debug_error_printed = True
-                print(f"[System] ⚠️ Error processing laptop command: {e}")
-                import traceback
-                traceback.print_exc()
-            pass
+                # Dispatch to the handler for this message type
+                handler = self._handlers.get(msg_type)
+                if handler:
+                    handler(message, addr, now)
+            
+            except BlockingIOError:
+                # Normal - socket drained
+                break
+            except (ValueError, KeyError, UnicodeDecodeError, AttributeError) as e:
+                # Bad payload - that datagram is consumed, carry on draining
+                self._report_laptop_error(e)
+                continue
+            except Exception as e:
+                # Socket error (or handler bug) - retrying here could spin forever and starve
+                # the failsafe; leave the rest for the next tick
+                self._report_laptop_error(e)
+                break
+        
+        if latest_control:
+            control, addr = latest_control
+            _, vx, vy, vr, speed, flags, gpio_bits = control
+            if fire_pending:
+                flags |= CTRL_FIRE
+            try:
+                self._handle_control(vx, vy, vr, speed, flags, gpio_bits, addr, now)
+            except Exception as e:
+                self._report_laptop_error(e)
+    
+    def _report_laptop_error(self, e: Exception):
+        """Only print first error to avoid spam"""
+        if not self._debug_error_printed:
+            self._debug_error_printed = True
+            print(f"[System] ⚠️ Error processing laptop command: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def _handle_config_request(self, message: Dict, addr, now: float):
+        """Laptop wants our config"""
+        print(f"[System] 📡 Config request from {addr}")
+        response = {
+            'type': 'CONFIG_RESPONSE',
+            'config': self.config
+        }
+        response_data = json.dumps(response).encode('utf-8')
+        self.laptop_sock.sendto(response_data, addr)
+        print(f"[System] ✅ Sent config to laptop")
+    
+    def _handle_heartbeat(self, message: Dict, addr, now: float):
+        """Laptop keep-alive"""
+        self.last_cmd_time = now
+    
+    def _handle_game_start(self, message: Dict, addr, now: float):
+        """Game start from laptop (laptop only sends if ready)"""
+        print("[System] 🎮 GAME_START from laptop!")
+        self.on_game_start()
+    
+    def _handle_game_end(self, message: Dict, addr, now: float):
+        """Game end from laptop"""
+        print("[System] 🏁 GAME_END from laptop!")
+        self.on_game_end()
     
-    async def control_loop(self):
-        """Main control loop"""
+    def _handle_control(self, vx: float, vy: float, vr: float, speed: float,
+                        flags: int, gpio_bits: int, addr, now: float):
+        """Drive/actuator command from laptop (fields of one CONTROL_FRAME)"""
+        # Update robot state
+        self.vx = vx
+        self.vy = vy
+        self.omega = vr
+        self.speed = max(0.0, min(1.0, speed))
+        self.estop = bool(flags & CTRL_ESTOP)
+        self.fire = bool(flags & CTRL_FIRE)
+        
+        self.last_cmd_time = now
+        self.last_input_time = now
+        
+        # Handle servo TOGGLES - only drive the servo when the toggle changes
+        servo1_max = bool(flags & CTRL_SERVO1)
+        if servo1_max != self._last_servo1:
+            self._last_servo1 = servo1_max
+            self._set_servo_toggle('servo_1', servo1_max)
+        
+        servo2_max = bool(flags & CTRL_SERVO2)
+        if servo2_max != self._last_servo2:
+            self._last_servo2 = servo2_max
+            self._set_servo_toggle('servo_2', servo2_max)
+        
+        # Handle GPIO bits - one bank write when any of them change
+        gpio_bits &= 0x0F
+        if gpio_bits != self._last_gpio_bits:
+            self.gpio_controller.set_gpio_mask(self._gpio_bit_masks[gpio_bits], self._gpio_enable_mask)
+            self._last_gpio_bits = gpio_bits
+        
+        # Handle light command (single flag drives both lights)
+        lights_on = bool(flags & CTRL_LIGHTS)
+        if lights_on != self._last_lights:
+            if self._d1 is not None:
+                self.gpio_controller.set_light_handle(self._d1, lights_on)
+            if self._d2 is not None:
+                self.gpio_controller.set_light_handle(self._d2, lights_on)
+            self._last_lights = lights_on
+        
+        # Fire weapon (send actual fire count back to laptop)
+        fire_success = False
+        if self.fire:
+            fire_success = self.ir_controller.fire()
+            if fire_success and self.motor_controller.hw_pwm_in_use:
+                self.motor_controller.invalidate_output()  # The shot's waveform cancelled hardware PWM
+        
+        # Exit standby if movement detected
+        if self.in_standby and (abs(self.vx) > 0.05 or abs(self.vy) > 0.05 or 
+                               abs(self.omega) > 0.05 or self.estop):
+            if not self.ir_controller.is_hit:
+                self.motor_controller.exit_standby()
+                self.in_standby = False
+        
+        # Send comprehensive status back to laptop (SINGLE MESSAGE) - at STATUS_PERIOD_S,
+        # or right away when a shot fired or hit/game state changed
+        self._laptop_addr = addr
+        if fire_success or self._status_dirty or now - self._last_status_send >= STATUS_PERIOD_S:
+            self._send_status(addr, fire_success, now)
+    
+    def _send_status(self, addr, fire_success: bool, now: float):
+        """Pack and send one STATUS frame (network loop only - shares _status_buf)"""
+        self._status_dirty = False
+        self._last_status_send = now
+        
+        ir = self.ir_controller
+        game = self.game_client
+        status_flags = 0
+        if fire_success:
+            status_flags |= STAT_FIRE_SUCCESS  # Tell laptop if fire actually happened
+        if ir.is_hit:
+            status_flags |= STAT_IS_HIT
+        if game.game_active:
+            status_flags |= STAT_GAME_ACTIVE
+        if game.is_ready:
+            status_flags |= STAT_IS_READY
+        if self.camera_streamer.fast_is_alive():
+            status_flags |= STAT_CAMERA_ACTIVE
+        
+        STATUS_FRAME.pack_into(self._status_buf, 0, MSG_STATUS, status_flags,
+                               ir.hit_by_team, ir.time_remaining, len(ir.hit_log),
+                               game.points, game.kills, game.deaths)
+        self.laptop_sock.sendto(self._status_buf, addr)
+    
+    def _set_servo_toggle(self, name: str, at_max: bool):
+        """Move a toggle servo to its MAX or MIN pulse"""
+        servo = self.servo_controller.servos.get(name, {})
+        if at_max:
+            self.servo_controller.set_servo_pulse(name, servo.get('max_pulse', 2460))
+        else:
+            self.servo_controller.set_servo_pulse(name, servo.get('min_pulse', 575))
+    
+    def control_loop(self):
+        """Main control loop - laptop commands here, motors on the tick thread"""
         print("\n[System] 🚀 Starting main control loop")
         
-        command_timeout = self.config['safety']['command_timeout_s']
-        power_save_timeout = self.config['safety']['power_save_timeout_s']
+        # Automatic GC can pause any thread mid-tick - collect at a safe point instead
+        gc.collect()
+        gc.disable()
         
-        while True:
-            now = time.time()
-            
-            # Process laptop commands
-            self.process_laptop_command()
+        # Motors and IR timer run on their own fixed-rate thread so network
+        # load (fire bursts, camera restarts) can't stretch the period
+        self._motor_thread = threading.Thread(target=self._motor_tick_loop, daemon=True)
+        self._motor_thread.start()
+        
+        # Network loop shares the I/O core with the camera, away from the tick thread
+        pin_current_thread(IO_CPUS, "Network loop")
+        
+        # Loop-invariant lookups bound once
+        select = self.sel.select
+        monotonic = time.monotonic
+        fire = self.ir_controller.fire
+        
+        while not self._stop.is_set():
+            # One kernel wait for every registered socket, capped at the 50 Hz tick
+            for key, _ in select(timeout=0.02):
+                key.data(monotonic())
             
-            # Update IR hit timer
-            self.ir_controller.update()
+            # Hit/game state changed with no CONTROL to reply to (the laptop only sends
+            # keepalives every 0.25s while idle) - push the STATUS now
+            if self._status_dirty and self._laptop_addr is not None:
+                try:
+                    self._send_status(self._laptop_addr, False, monotonic())
+                except OSError as e:
+                    self._report_laptop_error(e)
             
             # Handle fire command
             if self.fire:
-                self.ir_controller.fire()
+                if fire() and self.motor_controller.hw_pwm_in_use:
+                    self.motor_controller.invalidate_output()  # The shot's waveform cancelled hardware PWM
                 self.fire = False  # Reset fire flag after firing
+    
+    def _motor_tick_loop(self):
+        """50 Hz motor update paced by absolute monotonic deadlines"""
+        command_timeout = self.config['safety']['command_timeout_s']
+        power_save_timeout = self.config['safety']['power_save_timeout_s']
+        
+        pin_current_thread(MOTOR_CPUS, "Motor tick thread")
+        
+        # Real-time priority for this thread only (pid 0 = calling thread on Linux); needs root.
+        # It sleeps between ticks, so it never starves its core. Fall back to nice if refused.
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(MOTOR_RT_PRIORITY))
+            print(f"[System] Motor tick thread running SCHED_FIFO priority {MOTOR_RT_PRIORITY}")
+        except (AttributeError, OSError):
+            try:
+                os.nice(-10)
+            except OSError:
+                pass
+        
+        # Loop-invariant lookups bound once (state flags stay attributes - other threads write them)
+        ir = self.ir_controller
+        mc = self.motor_controller
+        ir_update = ir.update
+        stop_all = mc.stop_all
+        drive = mc.drive_mecanum
+        monotonic = time.monotonic
+        stop_wait = self._stop.wait
+        
+        drive_cmd = None  # (vx, vy, omega, speed) last passed to drive(); None after a stop
+        next_drive_refresh = 0.0
+        
+        next_tick = monotonic()
+        next_gc_young = next_tick + GC_YOUNG_PERIOD_S
+        next_gc_full = next_tick + GC_FULL_PERIOD_S
+        
+        while not self._stop.is_set():
+            # Monotonic clock: immune to wall-clock jumps that could trip the timeout
+            now = monotonic()
             
-            # Motor control logic
-            if self.ir_controller.is_hit or self.estop or (now - self.last_cmd_time) > command_timeout:
-                # Stop motors if hit, estop, or timeout
-                self.motor_controller.stop_all()
+            try:
+                # Update IR hit timer (respawn is a state change the laptop should see at once)
+                was_hit = ir.is_hit
+                ir_update()
+                if was_hit and not ir.is_hit:
+                    self._status_dirty = True
+                
+                # Motor control logic
+                if ir.is_hit or self.estop or (now - self.last_cmd_time) > command_timeout:
+                    # Stop motors if hit, estop, or timeout
+                    stop_all()
+                    drive_cmd = None
+                
+                elif (now - self.last_input_time) > power_save_timeout and not self.in_standby:
+                    # Enter power save mode
+                    mc.enter_standby()
+                    self.in_standby = True
+                    drive_cmd = None
+                
+                elif not self.in_standby and not ir.is_hit:
+                    # Normal driving - unchanged command skips mixing and pin writes until the refresh
+                    cmd = (self.vx, self.vy, self.omega, self.speed)
+                    if cmd != drive_cmd or now >= next_drive_refresh:
+                        if cmd == drive_cmd and mc.hw_pwm_in_use:
+                            # Refresh must really rewrite: a waveform may have cancelled hardware PWM
+                            mc.invalidate_output()
+                        drive(*cmd)
+                        drive_cmd = cmd
+                        next_drive_refresh = now + DRIVE_REFRESH_S
             
-            elif (now - self.last_input_time) > power_save_timeout and not self.in_standby:
-                # Enter power save mode
-                self.motor_controller.enter_standby()
-                self.in_standby = True
+            except Exception as e:
+                if not self._debug_tick_error_printed:
+                    self._debug_tick_error_printed = True
+                    print(f"[System] ⚠️ Motor tick error: {e}")
             
-            elif not self.in_standby and not self.ir_controller.is_hit:
-                # Normal driving
-                self.motor_controller.drive_mecanum(self.vx, self.vy, self.omega, self.speed)
+            # Motors are written for this tick - safe point for manual GC
+            if now >= next_gc_full:
+                gc.collect()
+                next_gc_full = now + GC_FULL_PERIOD_S
+                next_gc_young = now + GC_YOUNG_PERIOD_S
+            elif now >= next_gc_young:
+                gc.collect(0)
+                next_gc_young = now + GC_YOUNG_PERIOD_S
             
-            await asyncio.sleep(0.02)  # 50 Hz
+            # Sleep to the next absolute deadline (no drift from work time)
+            next_tick += MOTOR_TICK_S
+            delay = next_tick - monotonic()
+            if delay > 0:
+                stop_wait(delay)  # Sleeps like time.sleep, but returns at once on shutdown
+            else:
+                # Overran a whole period - resync rather than burst to catch up
+                next_tick = monotonic()
     
     def cleanup(self):
         """Clean up all resources"""
         print("\n[System] 🛑 Shutting down...")
         
+        # Stop the motor tick thread before releasing the hardware
+        self._stop.set()
+        if self._motor_thread:
+            self._motor_thread.join(timeout=1)
+        
         if self.motor_controller:
             self.motor_controller.cleanup()
         
@@ -389,6 +659,7 @@ class RobotSystem:
         if self.game_client:
             self.game_client.cleanup()
         
+        self.sel.close()
         if self.laptop_sock:
             self.laptop_sock.close()
         
@@ -397,13 +668,11 @@ class RobotSystem:
         
         print("[System] ✅ Shutdown complete")
     
-    async def run(self):
+    def run(self):
         """Main run function"""
-        # Setup signal handlers
-        loop = asyncio.get_running_loop()
-        
+        # Setup signal handlers (select() wakes on the signal, so shutdown is prompt)
         for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(sig, lambda: asyncio.create_task(self.shutdown()))
+            signal.signal(sig, self.shutdown)
         
         print("\n" + "=" * 60)
         print(f"🎯 {self.config['team']['team_name']} - {self.config['team']['robot_name']}")
@@ -412,27 +681,21 @@ class RobotSystem:
         print("\n✅ System ready - waiting for commands")
         
         try:
-            await self.control_loop()
-        except asyncio.CancelledError:
-            pass
+            self.control_loop()
         finally:
             self.cleanup()
     
-    async def shutdown(self):
-        """Graceful shutdown"""
+    def shutdown(self, signum=None, frame=None):
+        """Graceful shutdown - control_loop exits after the current select()"""
         print("\n[System] Shutdown signal received")
-        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
-        for task in tasks:
-            task.cancel()
-        await asyncio.gather(*tasks, return_exceptions=True)
-        asyncio.get_event_loop().stop()
+        self._stop.set()
 
 
 def main():
     """Entry point"""
     try:
         robot = RobotSystem()
-        asyncio.run(robot.run())
+        robot.run()
     
     except KeyboardInterrupt:
         print("\n[System] Keyboard interrupt")
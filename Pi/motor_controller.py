@@ -4,16 +4,104 @@ Motor Controller - Mecanum drive control with PWM
 """
 
 import pigpio
+import time
+from math import cos, sin
 from typing import Dict
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional - without it the mixer runs as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, fastmath=True)
+def _mecanum_mix(vx, vy, omega, max_speed, wheelbase, track,
+                 field_centric, cy, sy, inv0, inv1, inv2, inv3):
+    """Mecanum inverse kinematics -> (fl, fr, rl, rr) wheel speeds in -1..1
+
+    cy, sy are cos/sin of the robot yaw (only used when field_centric).
+    """
+    # Optional: rotate command from field frame into robot frame
+    if field_centric:
+        # field -> robot (x right, y forward)
+        vx, vy = cy*vx + sy*vy, -sy*vx + cy*vy
+
+    # Geometry term (half perimeter from center to wheel contact)
+    k = 0.5*(wheelbase + track)
+
+    # Wheel speeds (unnormalized)
+    fl = vy + vx + omega * k   # Front-Left
+    fr = vy - vx - omega * k   # Front-Right
+    rl = vy - vx + omega * k   # Rear-Left
+    rr = vy + vx - omega * k   # Rear-Right
+
+    # Normalize to keep |speed| <= 1
+    max_mag = max(1.0, abs(fl), abs(fr), abs(rl), abs(rr))
+
+    # Scale by requested speed (0..1)
+    fl *= -max_speed / max_mag
+    fr *= max_speed / max_mag
+    rl *= -max_speed / max_mag
+    rr *= max_speed / max_mag
+
+    # Per-wheel inversion for wiring differences
+    if inv0: fl = -fl
+    if inv1: fr = -fr
+    if inv2: rl = -rl
+    if inv3: rr = -rr
+
+    # Optional tiny deadband to kill motor buzz
+    if abs(fl) < 0.02: fl = 0.0
+    if abs(fr) < 0.02: fr = 0.0
+    if abs(rl) < 0.02: rl = 0.0
+    if abs(rr) < 0.02: rr = 0.0
+
+    return fl, fr, rl, rr
+
+
+WHEEL_NAMES = ('A', 'B', 'C', 'D')  # FL, FR, RL, RR
+YAW_EPSILON_RAD = 0.005  # Recompute cos/sin once yaw has moved this far
+STOPPED_OUTPUT = (0, 0, 0, 0, 0)  # (direction set mask, 4 duties) with every motor off
+SCRIPT_INIT_TIMEOUT_S = 1.0  # pigpiod compiles stored scripts asynchronously
+SCRIPT_HALT_TIMEOUT_S = 0.05  # Longest wait for a queued drive script run before writing pins directly
+HW_PWM_CHANNEL = {12: 0, 18: 0, 13: 1, 19: 1}  # GPIO -> hardware PWM channel (one pin per channel)
+HW_PWM_RANGE = 1_000_000  # hardware_PWM duty is in millionths
+
+
 class MotorController:
     def __init__(self, pi: pigpio.pi, config: Dict):
         self.pi = pi
+        
+        # Hot pigpio calls, bound once
+        self._pwm = pi.set_PWM_dutycycle
+        self._hw_pwm = pi.hardware_PWM
+        self._set_bank = pi.set_bank_1
+        self._clear_bank = pi.clear_bank_1
         self.motors = config['motors']
         self.standby_pins = self.motors.get('standby_pins', [])
         self.pwm_freq = self.motors.get('pwm_frequency', 10000)
         self.min_duty = self.motors.get('min_duty_cycle', 30)
         self.pure_dc_threshold = self.motors.get('pure_dc_threshold', 80)
+        # Opt-in: hardware_PWM() cancels any pigpio waveform in flight, i.e. an IR shot (wave_chain)
+        # fired while a duty changes gets cut off. Only enable with IR firing not in use.
+        self.use_hardware_pwm = self.motors.get('hardware_pwm', False)
+        
+        # Cached field-centric rotation (cos/sin of _last_yaw)
+        self._last_yaw = None
+        self._cy = 1.0
+        self._sy = 0.0
+        
+        # EN duty for each 0.1% of |speed| - min duty floor and pure DC folded in
+        self._duty_lut = [self._permille_to_duty(permille) for permille in range(1001)]
+        
+        # Compile (or load from cache) the numba mixer now - the first call otherwise JITs
+        # for seconds inside the motor tick, stalling its stop-on-timeout failsafe mid-match.
+        # Same argument types as drive_mecanum passes (floats, bools).
+        _mecanum_mix(0.0, 0.0, 0.0, 1.0, 1.0, 1.0, False, 1.0, 0.0, False, False, False, False)
         
         self.setup_motors()
     
@@ -39,46 +127,222 @@ class MotorController:
             # Set PWM frequency on enable pin
             self.pi.set_PWM_frequency(motor['EN'], self.pwm_freq)
         
+        # Per-wheel data as parallel lists indexed 0..3 (WHEEL_NAMES order)
+        # Direction bit masks are for bank writes (IN1 high = forward, IN2 high = reverse)
+        self._en = []
+        self._fwd_mask = []
+        self._rev_mask = []
+        self._dir = []
+        self._hw = []  # EN driven by the hardware PWM peripheral instead of pigpiod's DMA PWM
+        hw_channels_used = set()
+        for name in WHEEL_NAMES:
+            motor = self.motors.get(name)
+            if isinstance(motor, dict) and 'EN' in motor:
+                self._en.append(motor['EN'])
+                self._fwd_mask.append(1 << motor['IN1'])
+                self._rev_mask.append(1 << motor['IN2'])
+                self._dir.append(motor.get('direction_offset', 1))
+                
+                channel = HW_PWM_CHANNEL.get(motor['EN'])
+                hw = self.use_hardware_pwm and channel is not None and channel not in hw_channels_used
+                if hw:
+                    try:
+                        self._hw_pwm(motor['EN'], self.pwm_freq, 0)
+                        hw_channels_used.add(channel)
+                        print(f"[Motors] Motor {name} EN (GPIO {motor['EN']}) on hardware PWM channel {channel}")
+                    except pigpio.error as e:
+                        print(f"[Motors] ⚠️ Hardware PWM unavailable for motor {name} ({e}) - using software PWM")
+                        self._pwm(motor['EN'], 0)
+                        hw = False
+                self._hw.append(hw)
+            else:
+                self._en.append(None)  # Wheel not configured
+                self._fwd_mask.append(0)
+                self._rev_mask.append(0)
+                self._dir.append(1)
+                self._hw.append(False)
+        
+        self.hw_pwm_in_use = any(self._hw)
+        
+        self._all_in_mask = 0
+        for i in range(4):
+            self._all_in_mask |= self._fwd_mask[i] | self._rev_mask[i]
+        
+        # Pin state last written by apply_wheels/stop_all (None = unknown)
+        self._last_output = None
+        
+        # One pigpiod script applies a whole wheel update (None = per-call writes)
+        self._script_id = self._store_drive_script()
+        self._script_failures = 0  # Consecutive run_script errors (each falls back for that update only)
+        
         print(f"[Motors] Initialized {len([m for m in self.motors.values() if isinstance(m, dict) and 'EN' in m])} motors")
     
+    def _store_drive_script(self):
+        """Store a pigpiod script doing apply_wheels' writes: p0 clear mask, p1 set mask, p2..p5 duties"""
+        text = "bc1 p0 bs1 p1"
+        for i, en_pin in enumerate(self._en):
+            if en_pin is None:
+                continue
+            if self._hw[i]:
+                text += f" hp {en_pin} {self.pwm_freq} p{2 + i}"  # Duty param already in millionths
+            else:
+                text += f" pwm {en_pin} p{2 + i}"
+        
+        try:
+            script_id = self.pi.store_script(text.encode())
+            deadline = time.monotonic() + SCRIPT_INIT_TIMEOUT_S
+            status = self.pi.script_status(script_id)[0]
+            while status == pigpio.PI_SCRIPT_INITING and time.monotonic() < deadline:
+                time.sleep(0.01)
+                status = self.pi.script_status(script_id)[0]
+            if status != pigpio.PI_SCRIPT_HALTED:
+                self.pi.delete_script(script_id)
+                raise RuntimeError(f"script status {status}")
+        except Exception as e:
+            print(f"[Motors] ⚠️ Drive script unavailable ({e}) - using per-call writes")
+            return None
+        
+        self._run_script = self.pi.run_script
+        print(f"[Motors] Drive script stored (id {script_id})")
+        return script_id
+    
+    def invalidate_output(self):
+        """Forget the last written pin state - the next drive rewrites every pin even if unchanged
+        (hardware PWM duty is lost whenever a pigpio waveform, e.g. an IR shot, is sent)"""
+        self._last_output = None
+    
+    def _wait_script_halted(self):
+        """Wait for the last drive script run to finish, so direct pin writes made after it
+        aren't overwritten by an update still queued in pigpiod (run_script returns before it runs)"""
+        if self._script_id is None:
+            return
+        deadline = time.monotonic() + SCRIPT_HALT_TIMEOUT_S
+        try:
+            while (self.pi.script_status(self._script_id)[0] == pigpio.PI_SCRIPT_RUNNING
+                   and time.monotonic() < deadline):
+                time.sleep(0.001)
+        except Exception:
+            pass
+    
+    def _write_duty(self, i: int, duty: int):
+        """Write a 0..255 duty to wheel i's EN pin (hardware or pigpiod PWM)"""
+        if self._hw[i]:
+            self._hw_pwm(self._en[i], self.pwm_freq, duty * HW_PWM_RANGE // 255)
+        else:
+            self._pwm(self._en[i], duty)
+    
     def clamp(self, value: float, min_val: float = -1.0, max_val: float = 1.0) -> float:
         """Clamp value between min and max"""
         return max(min_val, min(max_val, value))
     
+    def speed_to_duty(self, magnitude: float) -> int:
+        """Map |speed| (0..1) to an EN duty cycle (0..255)"""
+        if magnitude < 1e-3:
+            return 0
+        return self._duty_lut[int(magnitude * 1000)]
+    
+    def _permille_to_duty(self, permille: int) -> int:
+        """EN duty cycle for a non-zero speed of `permille`/1000 (used to build _duty_lut)"""
+        if permille >= self.pure_dc_threshold * 10:
+            # Use pure DC for high speeds (full duty = EN held high)
+            return 255
+        
+        # Use PWM for lower speeds (thresholds in config are whole percent)
+        permille = max(self.min_duty * 10, permille)
+        return permille * 255 // 1000
+    
     def apply_motor(self, motor_name: str, normalized_speed: float):
         """Apply speed to a single motor"""
-        if motor_name not in self.motors or not isinstance(self.motors[motor_name], dict):
+        if motor_name not in WHEEL_NAMES:
             return
         
-        motor = self.motors[motor_name]
-        direction_offset = motor.get('direction_offset', 1)
-        normalized_speed = self.clamp(normalized_speed) * direction_offset
+        i = WHEEL_NAMES.index(motor_name)
+        en_pin = self._en[i]
+        if en_pin is None:
+            return
         
-        pins = motor
+        normalized_speed = self.clamp(normalized_speed) * self._dir[i]
+        duty = self.speed_to_duty(abs(normalized_speed))
         
-        # Stop motor if speed is near zero
-        if abs(normalized_speed) < 1e-3:
-            self.pi.set_PWM_dutycycle(pins['EN'], 0)
-            self.pi.write(pins['IN1'], 0)
-            self.pi.write(pins['IN2'], 0)
-            return
+        self._last_output = None  # One wheel changed outside apply_wheels
+        self._wait_script_halted()
         
-        # Set direction
-        forward = normalized_speed > 0
-        self.pi.write(pins['IN1'], 1 if forward else 0)
-        self.pi.write(pins['IN2'], 0 if forward else 1)
+        # Set direction (both IN pins low when stopped)
+        self._clear_bank(self._fwd_mask[i] | self._rev_mask[i])
+        if duty:
+            self._set_bank(self._fwd_mask[i] if normalized_speed > 0 else self._rev_mask[i])
         
         # Set speed
-        percent = int(abs(normalized_speed) * 100)
+        self._write_duty(i, duty)
+    
+    def apply_wheels(self, speeds):
+        """Apply (FL, FR, RL, RR) speeds - all direction pins in one bank write"""
+        en = self._en
+        fwd_mask = self._fwd_mask
+        rev_mask = self._rev_mask
+        direction = self._dir
+        duty_lut = self._duty_lut
         
-        if percent >= self.pure_dc_threshold:
-            # Use pure DC for high speeds
-            self.pi.write(pins['EN'], 1)
-        else:
-            # Use PWM for lower speeds
-            percent = max(self.min_duty, percent)
-            duty = percent * 255 // 100
-            self.pi.set_PWM_dutycycle(pins['EN'], duty)
+        set_mask = 0
+        duties = [0, 0, 0, 0]
+        
+        for i in range(4):
+            if en[i] is None:
+                continue
+            
+            normalized_speed = speeds[i] * direction[i]
+            if normalized_speed > 1.0:
+                normalized_speed = 1.0
+            elif normalized_speed < -1.0:
+                normalized_speed = -1.0
+            
+            magnitude = abs(normalized_speed)
+            duty = 0 if magnitude < 1e-3 else duty_lut[int(magnitude * 1000)]
+            duties[i] = duty
+            
+            # Set direction (both IN pins low when stopped)
+            if duty:
+                set_mask |= fwd_mask[i] if normalized_speed > 0 else rev_mask[i]
+        
+        # Same pins and duties as last time - nothing to write
+        output = (set_mask, duties[0], duties[1], duties[2], duties[3])
+        if output == self._last_output:
+            return
+        self._last_output = output
+        
+        # Clear first so IN1/IN2 are never both high mid-update
+        clear_mask = self._all_in_mask & ~set_mask
+        
+        # Whole update in one pigpiod round trip
+        if self._script_id is not None:
+            try:
+                hw = self._hw
+                params = [clear_mask, set_mask]
+                for i in range(4):
+                    params.append(duties[i] * HW_PWM_RANGE // 255 if hw[i] else duties[i])
+                self._run_script(self._script_id, params)
+                if self._script_failures:
+                    print(f"[Motors] Drive script running again after {self._script_failures} failed update(s)")
+                    self._script_failures = 0
+                return
+            except Exception as e:
+                # Usually transient (e.g. PI_NOT_HALTED: previous run still going) - write this
+                # update directly and try the script again next time
+                self._script_failures += 1
+                if self._script_failures == 1:
+                    print(f"[Motors] ⚠️ Drive script run failed ({e}) - using per-call writes until it recovers")
+                self._wait_script_halted()
+        
+        if clear_mask:
+            self._clear_bank(clear_mask)
+        if set_mask:
+            self._set_bank(set_mask)
+        
+        # Set speed
+        write_duty = self._write_duty
+        for i in range(4):
+            if en[i] is not None:
+                write_duty(i, duties[i])
     
     def drive_mecanum( self,
     vx: float,           # strafe: left(-) / right(+)
@@ -97,58 +361,36 @@ class MotorController:
         vx: +right, vy: +forward, omega: +CW (note: CW positive)
         """
 
-        # Optional: rotate command from field frame into robot frame
-        if field_centric:
-            import math
-            cy, sy = math.cos(yaw_rad), math.sin(yaw_rad)
-            # field -> robot (x right, y forward)
-            vx, vy =  cy*vx + sy*vy, -sy*vx + cy*vy
-
-        # Geometry term (half perimeter from center to wheel contact)
-        k = 0.5*(wheelbase + track)
-
-        # Wheel speeds (unnormalized)
-        fl =  vy + vx + omega * k   # Front-Left
-        fr =  vy - vx - omega * k   # Front-Right
-        rl =  vy - vx + omega * k   # Rear-Left
-        rr =  vy + vx - omega * k   # Rear-Right
-
-        # Normalize to keep |speed| <= 1
-        max_mag = max(1.0, abs(fl), abs(fr), abs(rl), abs(rr))
-        fl, fr, rl, rr = fl/max_mag, fr/max_mag, rl/max_mag, rr/max_mag
-
-        # Scale by requested speed (0..1)
-        fl *= -max_speed
-        fr *= max_speed
-        rl *= -max_speed
-        rr *= max_speed
-
-        # Per-wheel inversion for wiring differences
-        if invert[0]: fl = -fl
-        if invert[1]: fr = -fr
-        if invert[2]: rl = -rl
-        if invert[3]: rr = -rr
-
-        # Optional tiny deadband to kill motor buzz
-        def deadband(x, eps=0.02): return 0.0 if abs(x) < eps else x
-        fl, fr, rl, rr = map(deadband, (fl, fr, rl, rr))
+        # Idle and already stopped - skip the mixing and all pigpio writes
+        if (abs(vx) + abs(vy) + abs(omega) < 1e-3
+                and self._last_output == STOPPED_OUTPUT):
+            return
+
+        # Yaw moves slowly - only redo the trig when it has changed appreciably
+        if field_centric and (self._last_yaw is None or abs(yaw_rad - self._last_yaw) > YAW_EPSILON_RAD):
+            self._cy = cos(yaw_rad)
+            self._sy = sin(yaw_rad)
+            self._last_yaw = yaw_rad
+
+        fl, fr, rl, rr = _mecanum_mix(float(vx), float(vy), float(omega), float(max_speed),
+                                      float(wheelbase), float(track), bool(field_centric),
+                                      self._cy, self._sy, bool(invert[0]), bool(invert[1]),
+                                      bool(invert[2]), bool(invert[3]))
 
         # Apply to motors (A=FL, B=FR, C=RL, D=RR per your mapping)
-        self.apply_motor('A', fl)
-        self.apply_motor('B', fr)
-        self.apply_motor('C', rl)
-        self.apply_motor('D', rr)
+        self.apply_wheels((fl, fr, rl, rr))
 
     
     def stop_all(self):
         """Stop all motors immediately"""
-        for name in ['A', 'B', 'C', 'D']:
-            if name in self.motors:
-                motor = self.motors[name]
-                if isinstance(motor, dict) and 'EN' in motor:
-                    self.pi.set_PWM_dutycycle(motor['EN'], 0)
-                    self.pi.write(motor['IN1'], 0)
-                    self.pi.write(motor['IN2'], 0)
+        # A drive update queued via run_script could otherwise land after these writes
+        self._wait_script_halted()
+        for i in range(4):
+            if self._en[i] is not None:
+                self._write_duty(i, 0)
+        if self._all_in_mask:
+            self._clear_bank(self._all_in_mask)
+        self._last_output = STOPPED_OUTPUT
     
     def enter_standby(self):
         """Enter low power standby mode"""
@@ -167,5 +409,11 @@ class MotorController:
         """Clean up motor resources"""
         print("[Motors] Cleaning up...")
         self.stop_all()
+        if self._script_id is not None:
+            try:
+                self.pi.delete_script(self._script_id)
+            except Exception:
+                pass
+            self._script_id = None
         for pin in self.standby_pins:
             self.pi.write(pin, 0)